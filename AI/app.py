@@ -4,15 +4,24 @@
 
 # ----------------------------------------------
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 from groq import Groq
 import cohere
 import re
 import json
 import os
-import random
-import string
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from syllabus_cache import SyllabusCache, syllabus_cache_key
+from response_cache import SemanticResponseCache, normalize_message
+from singleflight import SingleFlight
+from syllabus_catalog import SyllabusCatalog
+from syllabus_store import SyllabusStore
+from syllabus_parser import SyllabusStreamParser, parse_syllabus_text
+from state_store import create_state_store
 
 # Initialize the Flask app
 app = Flask(__name__)
@@ -49,9 +58,105 @@ I can help with anything related to:
 Feel free to ask me anything within these topics, and let's get started on your learning path!
 """
 
-# Dictionary to store user-specific chat states for multi-turn conversation handling.
+# ----------------------------------------------
+# Conversation state
+# Stores user-specific chat states for multi-turn conversation handling.
 # This allows the application to remember the context of a conversation for each user.
-chat_states = {}
+# CHAT_STATE_BACKEND=memory keeps states in this process (single worker only);
+# CHAT_STATE_BACKEND=sqlite shares them through a local file between all worker processes.
+# Abandoned conversations expire after CHAT_STATE_TTL_SECONDS of inactivity.
+# ----------------------------------------------
+CHAT_STATE_BACKEND = os.environ.get('CHAT_STATE_BACKEND', 'memory')
+CHAT_STATE_DB_PATH = os.environ.get('CHAT_STATE_DB_PATH', 'chat_state.sqlite3')
+CHAT_STATE_MAX_ENTRIES = int(os.environ.get('CHAT_STATE_MAX_ENTRIES', 10000))
+CHAT_STATE_TTL_SECONDS = float(os.environ.get('CHAT_STATE_TTL_SECONDS', 30 * 60))
+
+chat_states = create_state_store(
+    CHAT_STATE_BACKEND,
+    "chat_states",
+    CHAT_STATE_DB_PATH,
+    max_entries=CHAT_STATE_MAX_ENTRIES,
+    ttl_seconds=CHAT_STATE_TTL_SECONDS
+)
+
+# ----------------------------------------------
+# Background syllabus jobs
+# With SYLLABUS_JOBS_ENABLED, the final workflow message returns a job id straight away and
+# a worker pool generates the syllabus. Job records live in the same kind of state store as
+# chat states, so any worker process can answer the status endpoints.
+# Off by default: the chat widget waits for the /chat reply and doesn't follow job ids, so
+# only enable it for clients that poll /syllabus/jobs/<id> or listen on /syllabus/jobs/<id>/events.
+# ----------------------------------------------
+SYLLABUS_JOBS_ENABLED = os.environ.get('SYLLABUS_JOBS_ENABLED', '0').lower() in ('1', 'true', 'yes')
+SYLLABUS_WORKERS = int(os.environ.get('SYLLABUS_WORKERS', 4))
+SYLLABUS_JOB_TTL_SECONDS = float(os.environ.get('SYLLABUS_JOB_TTL_SECONDS', 24 * 3600))
+
+syllabus_jobs = create_state_store(
+    CHAT_STATE_BACKEND,
+    "syllabus_jobs",
+    CHAT_STATE_DB_PATH,
+    max_entries=CHAT_STATE_MAX_ENTRIES,
+    ttl_seconds=SYLLABUS_JOB_TTL_SECONDS
+)
+syllabus_executor = ThreadPoolExecutor(max_workers=SYLLABUS_WORKERS, thread_name_prefix="syllabus")
+
+# ----------------------------------------------
+# Request coalescing
+# Identical syllabus requests (same normalized triple) and identical chat questions that
+# arrive while the first one is still running share a single upstream LLM call.
+# ----------------------------------------------
+syllabus_flight = SingleFlight()
+groq_flight = SingleFlight()
+
+# ----------------------------------------------
+# Syllabus cache
+# Generated syllabi are cached on disk, keyed on the normalized (proficiency, language, purpose)
+# triple. Size bound and TTL can be tuned through environment variables (0 disables either).
+# ----------------------------------------------
+SYLLABUS_CACHE_PATH = os.environ.get('SYLLABUS_CACHE_PATH', os.path.join("generated_syllabus", "syllabus_cache.sqlite3"))
+SYLLABUS_CACHE_MAX_ENTRIES = int(os.environ.get('SYLLABUS_CACHE_MAX_ENTRIES', 500))
+SYLLABUS_CACHE_TTL_SECONDS = float(os.environ.get('SYLLABUS_CACHE_TTL_SECONDS', 7 * 24 * 3600))
+
+syllabus_cache = SyllabusCache(
+    SYLLABUS_CACHE_PATH,
+    max_entries=SYLLABUS_CACHE_MAX_ENTRIES,
+    ttl_seconds=SYLLABUS_CACHE_TTL_SECONDS
+)
+
+# ----------------------------------------------
+# Syllabus storage
+# Every syllabus handed to a user is saved as a minified JSON file in generated_syllabus/
+# and indexed in a manifest (id -> file, user, parameters, creation time).
+# ----------------------------------------------
+SYLLABUS_STORE_DIR = os.environ.get('SYLLABUS_STORE_DIR', "generated_syllabus")
+
+syllabus_store = SyllabusStore(SYLLABUS_STORE_DIR)
+
+# ----------------------------------------------
+# Pre-generated syllabus catalog
+# Built offline by build_syllabus_catalog.py for the common (proficiency, language, purpose)
+# grid. Matching requests are answered from memory; generation is only the fallback.
+# ----------------------------------------------
+SYLLABUS_CATALOG_DIR = os.environ.get('SYLLABUS_CATALOG_DIR', "syllabus_catalog")
+
+syllabus_catalog = SyllabusCatalog(SYLLABUS_CATALOG_DIR)
+
+# ----------------------------------------------
+# Semantic response cache (optional)
+# When enabled, general /chat questions that repeat or closely paraphrase an earlier question
+# are answered from memory. RESPONSE_CACHE_THRESHOLD is the minimum cosine similarity of the
+# character n-gram vectors for a near-duplicate to count as a hit (1.0 = exact matches only).
+# ----------------------------------------------
+RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', '0').lower() in ('1', 'true', 'yes')
+RESPONSE_CACHE_THRESHOLD = float(os.environ.get('RESPONSE_CACHE_THRESHOLD', 0.9))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 1000))
+RESPONSE_CACHE_TTL_SECONDS = float(os.environ.get('RESPONSE_CACHE_TTL_SECONDS', 24 * 3600))
+
+response_cache = SemanticResponseCache(
+    threshold=RESPONSE_CACHE_THRESHOLD,
+    max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=RESPONSE_CACHE_TTL_SECONDS
+) if RESPONSE_CACHE_ENABLED else None
 
 # ----------------------------------------------
 # ROUTE: Health check API
@@ -63,6 +168,24 @@ chat_states = {}
 def test_connection():
     return jsonify({"status": "success", "message": "Backend is running!"})
 
+# ----------------------------------------------
+# ROUTE: Cache statistics
+# Endpoint: /stats
+# Method: GET
+# Description: Reports cache hit/miss counters and how many requests were coalesced.
+# ----------------------------------------------
+@app.route('/stats', methods=['GET'])
+def get_stats():
+    return jsonify({
+        "syllabus_catalog": syllabus_catalog.stats(),
+        "syllabus_cache": syllabus_cache.stats(),
+        "response_cache": response_cache.stats() if response_cache else None,
+        "single_flight": {
+            "syllabus": syllabus_flight.stats(),
+            "groq": groq_flight.stats()
+        }
+    })
+
 # ----------------------------------------------
 # ROUTE: Chat handler
 # Endpoint: /chat
@@ -80,65 +203,11 @@ def chat():
         # If the user message is empty, return the boilerplate welcome message
         if not user_message:
             return jsonify({"reply": BOILERPLATE_MESSAGE})
-        
-        # --- Syllabus Generation Workflow ---
-        # Check if the user is in an ongoing syllabus generation conversation
-        if user_id in chat_states:
-            state = chat_states[user_id]
-            
-            # Step 1: User previously asked to create a syllabus, now expecting confirmation
-            if state['expecting'] == 'syllabus_confirm':
-                # Check for affirmative responses to proceed with syllabus generation
-                if re.search(r'yes|yeah|sure|ok|okay|generate|proceed', user_message.lower()):
-                    # Transition to the next step: ask for proficiency level
-                    chat_states[user_id] = {'expecting': 'proficiency', 'syllabus_data': {}}
-                    return jsonify({"reply": "Great! What proficiency level do you need? (beginner, intermediate, advanced)"})
-                else:
-                    # User declined, cancel the syllabus flow
-                    chat_states.pop(user_id, None) # Remove user's state
-                    return jsonify({"reply": "No problem! Let me know if you need anything else."})
-
-            # Step 2: User is expected to provide proficiency level
-            elif state['expecting'] == 'proficiency':
-                state['syllabus_data']['proficiency'] = user_message.lower()
-                state['expecting'] = 'language' # Transition to next step: ask for language
-                return jsonify({"reply": "Which language would you like to learn?"})
-
-            # Step 3: User is expected to provide the language
-            elif state['expecting'] == 'language':
-                state['syllabus_data']['language'] = user_message
-                state['expecting'] = 'purpose' # Transition to next step: ask for purpose
-                return jsonify({"reply": "What is your purpose for learning this language? (e.g., travel, business, general knowledge)"})
-
-            # Step 4: User is expected to provide the purpose, then generate the syllabus
-            elif state['expecting'] == 'purpose':
-                state['syllabus_data']['purpose'] = user_message
-                syllabus_data = state['syllabus_data']
-
-                # Call the AI function to generate the syllabus based on collected data
-                syllabus = generate_syllabus(
-                    syllabus_data['proficiency'],
-                    syllabus_data['language'],
-                    syllabus_data['purpose']
-                )
-
-                # Save the generated syllabus to a randomly named JSON file
-                file_name = generate_random_filename()
-                with open(file_name, 'w', encoding='utf-8') as f:
-                    json.dump(syllabus, f, ensure_ascii=False, indent=4)
-
-                # Format the syllabus for a user-friendly chat response
-                formatted_syllabus = format_syllabus_for_chat(syllabus)
-                chat_states.pop(user_id, None) # Clear user's state after completing the workflow
-
-                return jsonify({"reply": f"Your syllabus has been saved! You can find it in {file_name}.\n\n{formatted_syllabus}"})
-
-        # --- Initial Syllabus Keyword Detection ---
-        # If no ongoing conversation, check if the user's message indicates a desire to generate a syllabus
-        if re.search(r'(create|generate|make|build|design).*syllabus', user_message.lower()):
-            # Initiate the syllabus generation workflow by setting the user's state
-            chat_states[user_id] = {'expecting': 'syllabus_confirm'}
-            return jsonify({"reply": "Would you like me to create a customized language learning syllabus for you?"})
+
+        # Let the syllabus workflow answer first if it owns this message
+        workflow_reply = handle_syllabus_workflow(user_message, user_id)
+        if workflow_reply is not None:
+            return jsonify(workflow_reply)
 
         # --- General AI Response ---
         # If no specific workflow is triggered, generate a general response using Groq AI
@@ -150,6 +219,371 @@ def chat():
         print(f"Error: {e}")
         return jsonify({"reply": "Sorry, something went wrong on the server. Please try again later."}), 500
 
+# ----------------------------------------------
+# ROUTE: Streaming chat handler
+# Endpoint: /chat/stream
+# Method: POST
+# Description: Same contract as /chat, but the reply is sent as Server-Sent Events.
+# General questions stream Groq tokens as they arrive ("token" events); workflow replies
+# are sent as a single "token" event (with "jobId" when a syllabus job was started).
+# A final "done" event closes the stream.
+# ----------------------------------------------
+@app.route('/chat/stream', methods=['POST'])
+def chat_stream():
+    data = request.get_json(silent=True) or {}
+    user_message = data.get('userMessage', '').strip()
+    user_id = data.get('userId', 'default_user')
+
+    def event_stream():
+        try:
+            if not user_message:
+                yield format_sse({"token": BOILERPLATE_MESSAGE})
+            else:
+                workflow_reply = handle_syllabus_workflow(user_message, user_id)
+                if workflow_reply is not None:
+                    yield format_sse({**workflow_reply, "token": workflow_reply["reply"]})
+                else:
+                    for token in stream_groq_response(user_message):
+                        yield format_sse({"token": token})
+        except Exception as e:
+            print(f"Error: {e}")
+            yield format_sse({"error": "Sorry, something went wrong on the server. Please try again later."}, event="error")
+        yield format_sse({}, event="done")
+
+    return Response(
+        stream_with_context(event_stream()),
+        mimetype='text/event-stream',
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # Stop reverse proxies (nginx) from buffering the stream
+        }
+    )
+
+# ----------------------------------------------
+# ROUTE: Streaming syllabus generation
+# Endpoint: /syllabus/stream
+# Method: POST
+# Body: {"proficiency": ..., "language": ..., "purpose": ..., "userId": ...}
+# Description: Sends each lesson as an "exchange" Server-Sent Event as soon as Cohere has
+# finished writing it, so the client can render lesson 1 while later lessons are generated.
+# Catalog and cached syllabi are replayed immediately. A final "done" event carries the
+# stored syllabus id.
+# ----------------------------------------------
+@app.route('/syllabus/stream', methods=['POST'])
+def syllabus_stream():
+    data = request.get_json(silent=True) or {}
+    syllabus_data = {key: str(data.get(key, '')).strip() for key in ('proficiency', 'language', 'purpose')}
+    if not all(syllabus_data.values()):
+        return jsonify({"error": "proficiency, language and purpose are required"}), 400
+    syllabus_data['proficiency'] = syllabus_data['proficiency'].lower()
+    user_id = data.get('userId', 'default_user')
+    params = (syllabus_data['proficiency'], syllabus_data['language'], syllabus_data['purpose'])
+
+    def event_stream():
+        try:
+            syllabus = lookup_syllabus(*params)
+            exchanges = syllabus if syllabus is not None else stream_syllabus(*params)
+
+            streamed = []
+            for exchange in exchanges:
+                yield format_sse({"index": len(streamed), "exchange": exchange}, event="exchange")
+                streamed.append(exchange)
+
+            if not streamed:
+                # Nothing usable was generated; don't store an empty syllabus
+                yield format_sse({"error": "Sorry, I couldn't generate the syllabus. Please try again later."}, event="error")
+                return
+            if syllabus is None:
+                syllabus_cache.put(*params, streamed)
+            record = syllabus_store.save(streamed, user_id, syllabus_data)
+            yield format_sse({"syllabusId": record['id'], "count": len(streamed)}, event="done")
+        except Exception as e:
+            print(f"Syllabus stream error: {e}")
+            yield format_sse({"error": "Sorry, I couldn't generate the syllabus. Please try again later."}, event="error")
+
+    return Response(
+        stream_with_context(event_stream()),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# ----------------------------------------------
+# ROUTE: Saved syllabus
+# Endpoint: /syllabus/<syllabus_id>
+# Method: GET
+# Description: Returns a saved syllabus and its manifest record by id.
+# ----------------------------------------------
+@app.route('/syllabus/<syllabus_id>', methods=['GET'])
+def get_saved_syllabus(syllabus_id):
+    record = syllabus_store.get_record(syllabus_id)
+    syllabus = syllabus_store.get(syllabus_id) if record else None
+    if syllabus is None:
+        return jsonify({"error": "Unknown syllabus id"}), 404
+    return jsonify({**record, "syllabus": syllabus})
+
+# ----------------------------------------------
+# ROUTE: Saved syllabi
+# Endpoint: /syllabi?userId=<user_id>&limit=<n>
+# Method: GET
+# Description: Lists the most recent manifest records, optionally for one user.
+# ----------------------------------------------
+@app.route('/syllabi', methods=['GET'])
+def list_saved_syllabi():
+    try:
+        limit = int(request.args.get('limit', 50))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    limit = max(1, min(limit, 500))  # SQLite treats a negative LIMIT as no limit
+    return jsonify({"syllabi": syllabus_store.list(request.args.get('userId'), limit)})
+
+# ----------------------------------------------
+# ROUTE: Syllabus job status
+# Endpoint: /syllabus/jobs/<job_id>
+# Method: GET
+# Description: Returns the job record; once "status" is "done" it also holds the reply,
+# the saved file name and the syllabus itself.
+# ----------------------------------------------
+@app.route('/syllabus/jobs/<job_id>', methods=['GET'])
+def get_syllabus_job(job_id):
+    job = syllabus_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job id"}), 404
+    return jsonify(job)
+
+# ----------------------------------------------
+# ROUTE: Syllabus job events
+# Endpoint: /syllabus/jobs/<job_id>/events
+# Method: GET
+# Description: Server-Sent Events alternative to polling. Sends a "status" event whenever the
+# job changes and closes the stream with a final "done" or "failed" event.
+# ----------------------------------------------
+@app.route('/syllabus/jobs/<job_id>/events', methods=['GET'])
+def syllabus_job_events(job_id):
+    if syllabus_jobs.get(job_id) is None:
+        return jsonify({"error": "Unknown job id"}), 404
+
+    def event_stream():
+        last_status = None
+        deadline = time.time() + 300  # Give up after 5 minutes
+        while time.time() < deadline:
+            job = syllabus_jobs.get(job_id)
+            if job is None:
+                yield format_sse({"error": "Unknown job id"}, event="failed")
+                return
+            if job['status'] in ('done', 'failed'):
+                yield format_sse(job, event=job['status'])
+                return
+            if job['status'] != last_status:
+                last_status = job['status']
+                yield format_sse(job, event="status")
+            time.sleep(0.5)
+        yield format_sse({"error": "Timed out waiting for the syllabus"}, event="failed")
+
+    return Response(
+        stream_with_context(event_stream()),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# ----------------------------------------------
+# FUNCTION: Run the multi-step syllabus workflow for a user
+# Parameters:
+# - user_message (str): The (non-empty) message from the user.
+# - user_id (str): The user whose conversation state should be used.
+# Returns:
+# - dict | None: The response payload ({"reply": ...}, plus "jobId" when the syllabus is being
+#   generated in the background), or None if the message is not part of the workflow.
+# ----------------------------------------------
+def handle_syllabus_workflow(user_message, user_id):
+    reply, syllabus_data = advance_syllabus_workflow(user_message, user_id)
+    if syllabus_data is None:
+        return {"reply": reply} if reply is not None else None
+
+    params = (syllabus_data['proficiency'], syllabus_data['language'], syllabus_data['purpose'])
+
+    # Catalog and cached syllabi are answered inline; only real generations go to the worker pool
+    syllabus = lookup_syllabus(*params)
+    if syllabus is None:
+        if SYLLABUS_JOBS_ENABLED:
+            job_id = create_syllabus_job(syllabus_data, user_id)
+            syllabus_executor.submit(run_syllabus_job, job_id, syllabus_data)
+            return {"reply": syllabus_job_reply(job_id), "jobId": job_id}
+
+        # Generate the syllabus inline based on collected data
+        syllabus = generate_and_cache_syllabus(*params)
+
+    return complete_syllabus_workflow(syllabus, user_id, syllabus_data)
+
+# ----------------------------------------------
+# FUNCTION: Advance the multi-step syllabus workflow by one message
+# Parameters:
+# - user_message (str): The (non-empty) message from the user.
+# - user_id (str): The user whose conversation state should be used.
+# Returns:
+# - tuple: (reply, syllabus_data). When all answers are collected, reply is None and
+#   syllabus_data holds proficiency/language/purpose; the caller generates the syllabus
+#   (blocking or awaitable) and finishes with complete_syllabus_workflow().
+#   (None, None) means the message is not part of the workflow.
+# ----------------------------------------------
+def advance_syllabus_workflow(user_message, user_id):
+    # --- Syllabus Generation Workflow ---
+    # Check if the user is in an ongoing syllabus generation conversation
+    state = chat_states.get(user_id)
+    if state is not None:
+
+        # Step 1: User previously asked to create a syllabus, now expecting confirmation
+        if state['expecting'] == 'syllabus_confirm':
+            # Check for affirmative responses to proceed with syllabus generation
+            if re.search(r'yes|yeah|sure|ok|okay|generate|proceed', user_message.lower()):
+                # Transition to the next step: ask for proficiency level
+                chat_states.set(user_id, {'expecting': 'proficiency', 'syllabus_data': {}})
+                return "Great! What proficiency level do you need? (beginner, intermediate, advanced)", None
+            else:
+                # User declined, cancel the syllabus flow
+                chat_states.delete(user_id) # Remove user's state
+                return "No problem! Let me know if you need anything else.", None
+
+        # Step 2: User is expected to provide proficiency level
+        elif state['expecting'] == 'proficiency':
+            state['syllabus_data']['proficiency'] = user_message.lower()
+            state['expecting'] = 'language' # Transition to next step: ask for language
+            chat_states.set(user_id, state)
+            return "Which language would you like to learn?", None
+
+        # Step 3: User is expected to provide the language
+        elif state['expecting'] == 'language':
+            state['syllabus_data']['language'] = user_message
+            state['expecting'] = 'purpose' # Transition to next step: ask for purpose
+            chat_states.set(user_id, state)
+            return "What is your purpose for learning this language? (e.g., travel, business, general knowledge)", None
+
+        # Step 4: User is expected to provide the purpose, then generate the syllabus
+        elif state['expecting'] == 'purpose':
+            state['syllabus_data']['purpose'] = user_message
+            syllabus_data = state['syllabus_data']
+
+            chat_states.delete(user_id) # Clear user's state after completing the workflow
+
+            return None, syllabus_data
+
+    # --- Initial Syllabus Keyword Detection ---
+    # If no ongoing conversation, check if the user's message indicates a desire to generate a syllabus
+    if re.search(r'(create|generate|make|build|design).*syllabus', user_message.lower()):
+        # Initiate the syllabus generation workflow by setting the user's state
+        chat_states.set(user_id, {'expecting': 'syllabus_confirm'})
+        return "Would you like me to create a customized language learning syllabus for you?", None
+
+    return None, None
+
+# ----------------------------------------------
+# FUNCTION: Save a generated syllabus and build the final workflow response
+# Parameters:
+# - syllabus (list): The structured syllabus generated by the AI.
+# - user_id (str): The user the syllabus was generated for.
+# - syllabus_data (dict): proficiency/language/purpose collected by the workflow.
+# Returns:
+# - dict: The response payload, with the reply and the stored syllabus id.
+# ----------------------------------------------
+def complete_syllabus_workflow(syllabus, user_id=None, syllabus_data=None):
+    record = syllabus_store.save(syllabus, user_id, syllabus_data)
+    return {"reply": syllabus_saved_reply(record, syllabus), "syllabusId": record['id']}
+
+# ----------------------------------------------
+# FUNCTION: Chat reply announcing a saved syllabus
+# ----------------------------------------------
+def syllabus_saved_reply(record, syllabus):
+    # Format the syllabus for a user-friendly chat response
+    formatted_syllabus = format_syllabus_for_chat(syllabus)
+    return (f"Your syllabus has been saved! You can find it in {syllabus_store.path(record)} "
+            f"(id {record['id']}).\n\n{formatted_syllabus}")
+
+# ----------------------------------------------
+# FUNCTION: Record a new (pending) syllabus job
+# Parameters:
+# - syllabus_data (dict): proficiency/language/purpose collected by the workflow.
+# - user_id (str): The user who asked for the syllabus.
+# Returns:
+# - str: The job id.
+# ----------------------------------------------
+def create_syllabus_job(syllabus_data, user_id):
+    job_id = uuid.uuid4().hex[:12]
+    now = time.time()
+    syllabus_jobs.set(job_id, {
+        "jobId": job_id,
+        "status": "pending",
+        "userId": user_id,
+        "params": syllabus_data,
+        "createdAt": now,
+        "updatedAt": now
+    })
+    return job_id
+
+# ----------------------------------------------
+# FUNCTION: Update a syllabus job record
+# Parameters:
+# - job_id (str): The job to update.
+# - **fields: Fields to merge into the record (e.g. status="running").
+# ----------------------------------------------
+def update_syllabus_job(job_id, **fields):
+    job = syllabus_jobs.get(job_id) or {"jobId": job_id}
+    job.update(fields, updatedAt=time.time())
+    syllabus_jobs.set(job_id, job)
+
+# ----------------------------------------------
+# FUNCTION: Worker entry point - generate, cache and save a syllabus for a job
+# Parameters:
+# - job_id (str): The job being processed.
+# - syllabus_data (dict): proficiency/language/purpose collected by the workflow.
+# ----------------------------------------------
+def run_syllabus_job(job_id, syllabus_data):
+    try:
+        update_syllabus_job(job_id, status="running")
+        syllabus = get_or_generate_syllabus(
+            syllabus_data['proficiency'],
+            syllabus_data['language'],
+            syllabus_data['purpose']
+        )
+        finish_syllabus_job(job_id, syllabus)
+    except Exception as e:
+        print(f"Syllabus job {job_id} failed: {e}")
+        update_syllabus_job(job_id, status="failed", error="Sorry, I couldn't generate the syllabus. Please try again later.")
+
+# ----------------------------------------------
+# FUNCTION: Save a finished syllabus and mark its job as done
+# ----------------------------------------------
+def finish_syllabus_job(job_id, syllabus):
+    job = syllabus_jobs.get(job_id) or {}
+    record = syllabus_store.save(syllabus, job.get('userId'), job.get('params'))
+    update_syllabus_job(
+        job_id,
+        status="done",
+        syllabusId=record['id'],
+        file=syllabus_store.path(record),
+        syllabus=syllabus,
+        reply=syllabus_saved_reply(record, syllabus)
+    )
+
+# ----------------------------------------------
+# FUNCTION: Chat reply sent while a syllabus job is running
+# ----------------------------------------------
+def syllabus_job_reply(job_id):
+    return (f"I'm preparing your syllabus now! This can take a few seconds. "
+            f"Your job id is {job_id}; check /syllabus/jobs/{job_id} for the result.")
+
+# ----------------------------------------------
+# FUNCTION: Format a payload as a Server-Sent Event
+# Parameters:
+# - payload (dict): JSON-serialisable data for the event.
+# - event (str): Optional SSE event name.
+# Returns:
+# - str: The encoded event, terminated by a blank line.
+# ----------------------------------------------
+def format_sse(payload, event=None):
+    message = f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+    if event:
+        message = f"event: {event}\n{message}"
+    return message
+
 # ----------------------------------------------
 # FUNCTION: Generate a response using Groq AI API
 # Parameters:
@@ -158,24 +592,17 @@ def chat():
 # - str: The AI-generated response.
 # ----------------------------------------------
 def generate_groq_response(user_message):
-    try:
-        # Define the messages for the AI, including a system role for context
-        messages = [
-            {"role": "system", "content": "You are a helpful assistant for a language learning platform called INDIC."},
-            {"role": "user", "content": user_message}
-        ]
-
-        # Call the Groq API to get a chat completion
-        completion = groq_client.chat.completions.create(
-            model="llama-3.3-70b-versatile", # Specify the AI model to use
-            messages=messages,
-            temperature=0.7, # Controls the randomness of the response (0.0 for deterministic, 1.0 for more creative)
-            max_completion_tokens=150, # Maximum number of tokens (words/parts of words) in the response
-            stream=False # Do not stream the response
-        )
+    # Answer repeated questions from the semantic cache when it is enabled
+    cached_reply = response_cache.get(user_message) if response_cache else None
+    if cached_reply is not None:
+        return cached_reply
 
-        # Extract and return the content of the AI's response
-        return completion.choices[0].message.content.strip()
+    try:
+        # Identical questions already waiting on Groq share that call
+        reply = groq_flight.do(normalize_message(user_message), request_groq_completion, user_message)
+        if response_cache:
+            response_cache.put(user_message, reply)
+        return reply
 
     except Exception as e:
         # Log and return a friendly error message if the Groq API call fails
@@ -183,19 +610,74 @@ def generate_groq_response(user_message):
         return "Sorry, I couldn't generate a response. Please try again later."
 
 # ----------------------------------------------
-# FUNCTION: Generate a random file name and create a directory if it doesn't exist
+# FUNCTION: Call the Groq API for a chat completion
+# Parameters:
+# - user_message (str): The message from the user to send to the AI.
 # Returns:
-# - str: The path to the generated JSON file.
+# - str: The AI-generated response (raises if the API call fails).
 # ----------------------------------------------
-def generate_random_filename():
-    folder_path = "generated_syllabus"
-    # Create the directory if it doesn't already exist
-    if not os.path.exists(folder_path):
-        os.makedirs(folder_path)
+def request_groq_completion(user_message):
+    completion = groq_client.chat.completions.create(
+        model="llama-3.3-70b-versatile", # Specify the AI model to use
+        messages=build_groq_messages(user_message),
+        temperature=0.7, # Controls the randomness of the response (0.0 for deterministic, 1.0 for more creative)
+        max_completion_tokens=150, # Maximum number of tokens (words/parts of words) in the response
+        stream=False # Do not stream the response
+    )
+
+    # Extract and return the content of the AI's response
+    return completion.choices[0].message.content.strip()
+
+# ----------------------------------------------
+# FUNCTION: Stream a response from Groq AI API token by token
+# Parameters:
+# - user_message (str): The message from the user to send to the AI.
+# Yields:
+# - str: Pieces of the AI-generated response as soon as Groq sends them.
+# ----------------------------------------------
+def stream_groq_response(user_message):
+    cached_reply = response_cache.get(user_message) if response_cache else None
+    if cached_reply is not None:
+        yield cached_reply
+        return
+
+    try:
+        stream = groq_client.chat.completions.create(
+            model="llama-3.3-70b-versatile",
+            messages=build_groq_messages(user_message),
+            temperature=0.7,
+            max_completion_tokens=150,
+            stream=True # Receive the completion as a sequence of chunks
+        )
+
+        tokens = []
+        for chunk in stream:
+            token = chunk.choices[0].delta.content if chunk.choices else None
+            if token:
+                tokens.append(token)
+                yield token
+
+        # Only a fully received completion is cached
+        if response_cache:
+            response_cache.put(user_message, "".join(tokens).strip())
+
+    except Exception as e:
+        # Same friendly fallback as the blocking variant
+        print(f"Groq API Error: {e}")
+        yield "Sorry, I couldn't generate a response. Please try again later."
 
-    # Generate a random string for the filename to ensure uniqueness
-    random_str = ''.join(random.choices(string.ascii_letters + string.digits, k=8))
-    return os.path.join(folder_path, f"syllabus_{random_str}.json")
+# ----------------------------------------------
+# FUNCTION: Build the Groq chat messages for a user message
+# Parameters:
+# - user_message (str): The message from the user to send to the AI.
+# Returns:
+# - list: The messages, including a system role for context.
+# ----------------------------------------------
+def build_groq_messages(user_message):
+    return [
+        {"role": "system", "content": "You are a helpful assistant for a language learning platform called INDIC."},
+        {"role": "user", "content": user_message}
+    ]
 
 # ----------------------------------------------
 # FUNCTION: Generate syllabus using Cohere's LLM
@@ -207,45 +689,92 @@ def generate_random_filename():
 # - list: A list of dictionaries, each representing a structured exchange in the syllabus.
 # ----------------------------------------------
 def generate_syllabus(proficiency, language, purpose):
-    # Construct a detailed prompt for Cohere's LLM to generate a structured learning script
-    input_prompt = (
-        f"Generate a structured learning conversation script for learning {language} "
-        f"at the {proficiency} level, focusing on {purpose}. The dialogue should be engaging and realistic, mimicking "
-        f"a real classroom session where the teacher explains concepts, asks questions, and the student responds. "
-        f"Ensure at least 10 structured exchanges. Start each teacher's turn with 'Teacher:' and each student's turn with 'Student:'."
-    )
-
     # Call the Cohere API to generate the text
     response = cohere_client.generate(
         model='command', # Specify the Cohere model
-        prompt=input_prompt,
+        prompt=build_syllabus_prompt(proficiency, language, purpose),
         max_tokens=1024, # Maximum number of tokens in the generated response
         temperature=0.7, # Controls creativity
     )
 
-    output_text = response.generations[0].text.strip()
-    structured_syllabus = []
-    
-    # Split the output text by "Teacher:" to parse individual exchanges
-    # The first element might be empty or a pre-amble, so we start processing from the second element.
-    exchanges = output_text.split("Teacher:")
-
-    # Process the conversation into a structured JSON-like format
-    for exchange in exchanges:
-        lines = exchange.strip().split("Student:") # Split each exchange into teacher and student parts
-        if len(lines) >= 2: # Ensure both teacher and student parts are present
-            teacher_text = lines[0].strip()
-            student_expected = lines[1].strip()
-
-            # Append the structured exchange to the list
-            structured_syllabus.append({
-                "text": teacher_text,
-                "expected": student_expected,
-                "english": "", # Placeholder for potential future translation
-                "animation": "" # Placeholder for potential future animation cues
-            })
-
-    return structured_syllabus
+    return parse_syllabus_text(response.generations[0].text)
+
+# ----------------------------------------------
+# FUNCTION: Look up a ready-made syllabus, first in the catalog and then in the cache
+# Parameters:
+# - proficiency (str), language (str), purpose (str): As for generate_syllabus.
+# Returns:
+# - list | None: The syllabus, or None if it has to be generated.
+# ----------------------------------------------
+def lookup_syllabus(proficiency, language, purpose):
+    syllabus = syllabus_catalog.get(proficiency, language, purpose)
+    if syllabus is None:
+        syllabus = syllabus_cache.get(proficiency, language, purpose)
+    return syllabus
+
+# ----------------------------------------------
+# FUNCTION: Return a cached syllabus, generating (and caching) it on a miss
+# Parameters:
+# - proficiency (str), language (str), purpose (str): As for generate_syllabus.
+# Returns:
+# - list: The structured syllabus.
+# ----------------------------------------------
+def get_or_generate_syllabus(proficiency, language, purpose):
+    syllabus = lookup_syllabus(proficiency, language, purpose)
+    if syllabus is None:
+        syllabus = generate_and_cache_syllabus(proficiency, language, purpose)
+    return syllabus
+
+# ----------------------------------------------
+# FUNCTION: Generate a syllabus and cache it, coalescing identical concurrent requests
+# Parameters:
+# - proficiency (str), language (str), purpose (str): As for generate_syllabus.
+# Returns:
+# - list: The structured syllabus (shared by every coalesced caller).
+# ----------------------------------------------
+def generate_and_cache_syllabus(proficiency, language, purpose):
+    def generate():
+        syllabus = generate_syllabus(proficiency, language, purpose)
+        if syllabus: # Don't cache an empty parse of a malformed generation
+            syllabus_cache.put(proficiency, language, purpose, syllabus)
+        return syllabus
+
+    return syllabus_flight.do(syllabus_cache_key(proficiency, language, purpose), generate)
+
+# ----------------------------------------------
+# FUNCTION: Build the Cohere prompt for a syllabus
+# Parameters:
+# - proficiency (str), language (str), purpose (str): As for generate_syllabus.
+# Returns:
+# - str: A detailed prompt asking for a structured learning script.
+# ----------------------------------------------
+def build_syllabus_prompt(proficiency, language, purpose):
+    return (
+        f"Generate a structured learning conversation script for learning {language} "
+        f"at the {proficiency} level, focusing on {purpose}. The dialogue should be engaging and realistic, mimicking "
+        f"a real classroom session where the teacher explains concepts, asks questions, and the student responds. "
+        f"Ensure at least 10 structured exchanges. Start each teacher's turn with 'Teacher:' and each student's turn with 'Student:'."
+    )
+
+# ----------------------------------------------
+# FUNCTION: Stream a syllabus from Cohere, exchange by exchange
+# Parameters:
+# - proficiency (str), language (str), purpose (str): As for generate_syllabus.
+# Yields:
+# - dict: Each structured exchange as soon as it is complete.
+# ----------------------------------------------
+def stream_syllabus(proficiency, language, purpose):
+    parser = SyllabusStreamParser()
+    stream = cohere_client.generate_stream(
+        model='command',
+        prompt=build_syllabus_prompt(proficiency, language, purpose),
+        max_tokens=1024,
+        temperature=0.7,
+    )
+    for event in stream:
+        if getattr(event, 'event_type', None) == 'text-generation':
+            yield from parser.feed(event.text)
+    yield from parser.close()
 
 # ----------------------------------------------
 # FUNCTION: Format syllabus into a chat-readable format
@@ -0,0 +1,461 @@
+# ----------------------------------------------
+# INDIC AI Chat Backend - Async (ASGI) serving mode
+# Description: Same API as app.py, served by Quart so that Groq and Cohere calls are
+# awaitable I/O instead of blocking a worker thread. One process can keep hundreds of
+# LLM calls in flight; LLM_MAX_CONCURRENCY caps how many run at the same time.
+#
+# Run with an ASGI server, e.g.:
+#   hypercorn async_app:app --bind 127.0.0.1:5500
+#   uvicorn async_app:app --host 127.0.0.1 --port 5500
+# Requires: quart, quart-cors (plus groq and cohere, as for app.py)
+# ----------------------------------------------
+
+from quart import Quart, Response, request, jsonify
+from quart_cors import cors
+from groq import AsyncGroq
+import cohere
+import asyncio
+import os
+
+# The conversation workflow, prompts and parsing are shared with the Flask app
+from app import (
+    GROQ_API_KEY,
+    COHERE_API_KEY,
+    BOILERPLATE_MESSAGE,
+    SYLLABUS_JOBS_ENABLED,
+    syllabus_catalog,
+    syllabus_cache,
+    response_cache,
+    syllabus_jobs,
+    create_syllabus_job,
+    update_syllabus_job,
+    lookup_syllabus,
+    syllabus_store,
+    finish_syllabus_job,
+    syllabus_job_reply,
+    advance_syllabus_workflow,
+    complete_syllabus_workflow,
+    build_groq_messages,
+    build_syllabus_prompt,
+    parse_syllabus_text,
+    format_sse,
+)
+from syllabus_cache import syllabus_cache_key
+from response_cache import normalize_message
+from singleflight import AsyncSingleFlight
+from syllabus_parser import SyllabusStreamParser
+
+# Initialize the Quart app (Flask-compatible API, ASGI underneath)
+app = Quart(__name__)
+app = cors(app, allow_origin="*")
+
+# Maximum number of LLM calls allowed in flight at once (per process)
+LLM_MAX_CONCURRENCY = int(os.environ.get('LLM_MAX_CONCURRENCY', 100))
+
+# ----------------------------------------------
+# CLASS: Async LLM gateway
+# Description: Wraps the async Groq and Cohere clients behind a shared concurrency cap.
+# Requests over the cap wait on the semaphore instead of opening more upstream connections,
+# and identical requests already in flight are coalesced into one upstream call.
+# ----------------------------------------------
+class AsyncLLMGateway:
+    def __init__(self, max_concurrency):
+        self.groq_client = AsyncGroq(api_key=GROQ_API_KEY)
+        self.cohere_client = cohere.AsyncClient(COHERE_API_KEY)
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.groq_flight = AsyncSingleFlight()
+        self.syllabus_flight = AsyncSingleFlight()
+        self._semaphore = None
+
+    @property
+    def semaphore(self):
+        # Created lazily so it binds to the server's running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    # Generate a general chat reply with Groq (same behaviour as app.generate_groq_response)
+    async def generate_groq_response(self, user_message):
+        cached_reply = response_cache.get(user_message) if response_cache else None
+        if cached_reply is not None:
+            return cached_reply
+
+        try:
+            reply = await self.groq_flight.do(
+                normalize_message(user_message), self._request_groq_completion, user_message
+            )
+            if response_cache:
+                response_cache.put(user_message, reply)
+            return reply
+
+        except Exception as e:
+            print(f"Groq API Error: {e}")
+            return "Sorry, I couldn't generate a response. Please try again later."
+
+    async def _request_groq_completion(self, user_message):
+        async with self.semaphore:
+            self.in_flight += 1
+            try:
+                completion = await self.groq_client.chat.completions.create(
+                    model="llama-3.3-70b-versatile",
+                    messages=build_groq_messages(user_message),
+                    temperature=0.7,
+                    max_completion_tokens=150,
+                    stream=False
+                )
+            finally:
+                self.in_flight -= 1
+
+        return completion.choices[0].message.content.strip()
+
+    # Stream a chat reply from Groq, yielding tokens as they arrive
+    async def stream_groq_response(self, user_message):
+        cached_reply = response_cache.get(user_message) if response_cache else None
+        if cached_reply is not None:
+            yield cached_reply
+            return
+
+        try:
+            async with self.semaphore:
+                self.in_flight += 1
+                try:
+                    stream = await self.groq_client.chat.completions.create(
+                        model="llama-3.3-70b-versatile",
+                        messages=build_groq_messages(user_message),
+                        temperature=0.7,
+                        max_completion_tokens=150,
+                        stream=True
+                    )
+                    tokens = []
+                    async for chunk in stream:
+                        token = chunk.choices[0].delta.content if chunk.choices else None
+                        if token:
+                            tokens.append(token)
+                            yield token
+                finally:
+                    self.in_flight -= 1
+
+            if response_cache:
+                response_cache.put(user_message, "".join(tokens).strip())
+
+        except Exception as e:
+            print(f"Groq API Error: {e}")
+            yield "Sorry, I couldn't generate a response. Please try again later."
+
+    # Generate and cache a syllabus, coalescing identical concurrent requests
+    # (same behaviour as app.generate_and_cache_syllabus)
+    async def generate_and_cache_syllabus(self, proficiency, language, purpose):
+        async def generate():
+            syllabus = await self.generate_syllabus(proficiency, language, purpose)
+            if syllabus:
+                await asyncio.to_thread(syllabus_cache.put, proficiency, language, purpose, syllabus)
+            return syllabus
+
+        return await self.syllabus_flight.do(syllabus_cache_key(proficiency, language, purpose), generate)
+
+    # Generate a syllabus with Cohere (same behaviour as app.generate_syllabus)
+    async def generate_syllabus(self, proficiency, language, purpose):
+        async with self.semaphore:
+            self.in_flight += 1
+            try:
+                response = await self.cohere_client.generate(
+                    model='command',
+                    prompt=build_syllabus_prompt(proficiency, language, purpose),
+                    max_tokens=1024,
+                    temperature=0.7,
+                )
+            finally:
+                self.in_flight -= 1
+
+        return parse_syllabus_text(response.generations[0].text)
+
+    # Stream a syllabus from Cohere, yielding each exchange as soon as it is complete
+    async def stream_syllabus(self, proficiency, language, purpose):
+        parser = SyllabusStreamParser()
+        async with self.semaphore:
+            self.in_flight += 1
+            try:
+                stream = self.cohere_client.generate_stream(
+                    model='command',
+                    prompt=build_syllabus_prompt(proficiency, language, purpose),
+                    max_tokens=1024,
+                    temperature=0.7,
+                )
+                async for event in stream:
+                    if getattr(event, 'event_type', None) == 'text-generation':
+                        for exchange in parser.feed(event.text):
+                            yield exchange
+            finally:
+                self.in_flight -= 1
+        for exchange in parser.close():
+            yield exchange
+
+llm_gateway = AsyncLLMGateway(LLM_MAX_CONCURRENCY)
+
+# Background syllabus jobs still running (kept referenced so they aren't garbage collected)
+background_jobs = set()
+
+# ----------------------------------------------
+# FUNCTION: Run the syllabus workflow, awaiting the syllabus generation
+# Returns:
+# - dict | None: The response payload (see app.handle_syllabus_workflow), or None if the
+#   message is not part of the workflow.
+# ----------------------------------------------
+async def handle_syllabus_workflow(user_message, user_id):
+    # The state store may be a SQLite file; advance the workflow off the event loop
+    reply, syllabus_data = await asyncio.to_thread(advance_syllabus_workflow, user_message, user_id)
+    if syllabus_data is None:
+        return {"reply": reply} if reply is not None else None
+
+    params = (syllabus_data['proficiency'], syllabus_data['language'], syllabus_data['purpose'])
+
+    # Catalog first, then the syllabus cache (a local SQLite file, so off the event loop)
+    syllabus = await asyncio.to_thread(lookup_syllabus, *params)
+    if syllabus is None:
+        if SYLLABUS_JOBS_ENABLED:
+            job_id = await asyncio.to_thread(create_syllabus_job, syllabus_data, user_id)
+            task = asyncio.create_task(run_syllabus_job(job_id, params))
+            background_jobs.add(task)
+            task.add_done_callback(background_jobs.discard)
+            return {"reply": syllabus_job_reply(job_id), "jobId": job_id}
+
+        syllabus = await llm_gateway.generate_and_cache_syllabus(*params)
+
+    # Saving is a small local file write; keep it off the event loop anyway
+    return await asyncio.to_thread(complete_syllabus_workflow, syllabus, user_id, syllabus_data)
+
+# ----------------------------------------------
+# FUNCTION: Background task - generate, cache and save a syllabus for a job
+# ----------------------------------------------
+async def run_syllabus_job(job_id, params):
+    try:
+        await asyncio.to_thread(update_syllabus_job, job_id, status="running")
+        syllabus = await llm_gateway.generate_and_cache_syllabus(*params)
+        await asyncio.to_thread(finish_syllabus_job, job_id, syllabus)
+    except Exception as e:
+        print(f"Syllabus job {job_id} failed: {e}")
+        await asyncio.to_thread(
+            update_syllabus_job, job_id,
+            status="failed", error="Sorry, I couldn't generate the syllabus. Please try again later."
+        )
+
+# ----------------------------------------------
+# ROUTE: Health check API
+# Endpoint: /test
+# Method: GET
+# ----------------------------------------------
+@app.route('/test', methods=['GET'])
+async def test_connection():
+    return jsonify({
+        "status": "success",
+        "message": "Backend is running!",
+        "llm_in_flight": llm_gateway.in_flight,
+        "llm_max_concurrency": llm_gateway.max_concurrency
+    })
+
+# ----------------------------------------------
+# ROUTE: Cache statistics
+# Endpoint: /stats
+# Method: GET
+# ----------------------------------------------
+@app.route('/stats', methods=['GET'])
+async def get_stats():
+    return jsonify({
+        "syllabus_catalog": syllabus_catalog.stats(),
+        "syllabus_cache": await asyncio.to_thread(syllabus_cache.stats),
+        "response_cache": response_cache.stats() if response_cache else None,
+        "single_flight": {
+            "syllabus": llm_gateway.syllabus_flight.stats(),
+            "groq": llm_gateway.groq_flight.stats()
+        }
+    })
+
+# ----------------------------------------------
+# ROUTE: Chat handler
+# Endpoint: /chat
+# Method: POST
+# Description: Async version of app.chat().
+# ----------------------------------------------
+@app.route('/chat', methods=['POST'])
+async def chat():
+    try:
+        data = await request.get_json()
+        user_message = data.get('userMessage', '').strip()
+        user_id = data.get('userId', 'default_user')
+
+        if not user_message:
+            return jsonify({"reply": BOILERPLATE_MESSAGE})
+
+        workflow_reply = await handle_syllabus_workflow(user_message, user_id)
+        if workflow_reply is not None:
+            return jsonify(workflow_reply)
+
+        response = await llm_gateway.generate_groq_response(user_message)
+        return jsonify({"reply": response})
+
+    except Exception as e:
+        print(f"Error: {e}")
+        return jsonify({"reply": "Sorry, something went wrong on the server. Please try again later."}), 500
+
+# ----------------------------------------------
+# ROUTE: Streaming chat handler
+# Endpoint: /chat/stream
+# Method: POST
+# Description: Async version of app.chat_stream() (Server-Sent Events).
+# ----------------------------------------------
+@app.route('/chat/stream', methods=['POST'])
+async def chat_stream():
+    data = await request.get_json(silent=True) or {}
+    user_message = data.get('userMessage', '').strip()
+    user_id = data.get('userId', 'default_user')
+
+    async def event_stream():
+        try:
+            if not user_message:
+                yield format_sse({"token": BOILERPLATE_MESSAGE})
+            else:
+                workflow_reply = await handle_syllabus_workflow(user_message, user_id)
+                if workflow_reply is not None:
+                    yield format_sse({**workflow_reply, "token": workflow_reply["reply"]})
+                else:
+                    async for token in llm_gateway.stream_groq_response(user_message):
+                        yield format_sse({"token": token})
+        except Exception as e:
+            print(f"Error: {e}")
+            yield format_sse({"error": "Sorry, something went wrong on the server. Please try again later."}, event="error")
+        yield format_sse({}, event="done")
+
+    response = Response(event_stream(), mimetype='text/event-stream')
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    response.timeout = None  # Long generations must not be cut off by Quart's response timeout
+    return response
+
+# ----------------------------------------------
+# ROUTE: Streaming syllabus generation
+# Endpoint: /syllabus/stream
+# Method: POST
+# Description: Async version of app.syllabus_stream() (Server-Sent Events).
+# ----------------------------------------------
+@app.route('/syllabus/stream', methods=['POST'])
+async def syllabus_stream():
+    data = await request.get_json(silent=True) or {}
+    syllabus_data = {key: str(data.get(key, '')).strip() for key in ('proficiency', 'language', 'purpose')}
+    if not all(syllabus_data.values()):
+        return jsonify({"error": "proficiency, language and purpose are required"}), 400
+    syllabus_data['proficiency'] = syllabus_data['proficiency'].lower()
+    user_id = data.get('userId', 'default_user')
+    params = (syllabus_data['proficiency'], syllabus_data['language'], syllabus_data['purpose'])
+
+    async def event_stream():
+        try:
+            syllabus = await asyncio.to_thread(lookup_syllabus, *params)
+            streamed = []
+            if syllabus is not None:
+                for exchange in syllabus:
+                    yield format_sse({"index": len(streamed), "exchange": exchange}, event="exchange")
+                    streamed.append(exchange)
+            else:
+                async for exchange in llm_gateway.stream_syllabus(*params):
+                    yield format_sse({"index": len(streamed), "exchange": exchange}, event="exchange")
+                    streamed.append(exchange)
+                if streamed:
+                    await asyncio.to_thread(syllabus_cache.put, *params, streamed)
+
+            if not streamed:
+                # Nothing usable was generated; don't store an empty syllabus
+                yield format_sse({"error": "Sorry, I couldn't generate the syllabus. Please try again later."}, event="error")
+                return
+            record = await asyncio.to_thread(syllabus_store.save, streamed, user_id, syllabus_data)
+            yield format_sse({"syllabusId": record['id'], "count": len(streamed)}, event="done")
+        except Exception as e:
+            print(f"Syllabus stream error: {e}")
+            yield format_sse({"error": "Sorry, I couldn't generate the syllabus. Please try again later."}, event="error")
+
+    response = Response(event_stream(), mimetype='text/event-stream')
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    response.timeout = None
+    return response
+
+# ----------------------------------------------
+# ROUTE: Saved syllabus
+# Endpoint: /syllabus/<syllabus_id>
+# Method: GET
+# ----------------------------------------------
+@app.route('/syllabus/<syllabus_id>', methods=['GET'])
+async def get_saved_syllabus(syllabus_id):
+    record = await asyncio.to_thread(syllabus_store.get_record, syllabus_id)
+    syllabus = await asyncio.to_thread(syllabus_store.get, syllabus_id) if record else None
+    if syllabus is None:
+        return jsonify({"error": "Unknown syllabus id"}), 404
+    return jsonify({**record, "syllabus": syllabus})
+
+# ----------------------------------------------
+# ROUTE: Saved syllabi
+# Endpoint: /syllabi?userId=<user_id>&limit=<n>
+# Method: GET
+# ----------------------------------------------
+@app.route('/syllabi', methods=['GET'])
+async def list_saved_syllabi():
+    try:
+        limit = int(request.args.get('limit', 50))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    limit = max(1, min(limit, 500))  # SQLite treats a negative LIMIT as no limit
+    records = await asyncio.to_thread(syllabus_store.list, request.args.get('userId'), limit)
+    return jsonify({"syllabi": records})
+
+# ----------------------------------------------
+# ROUTE: Syllabus job status
+# Endpoint: /syllabus/jobs/<job_id>
+# Method: GET
+# ----------------------------------------------
+@app.route('/syllabus/jobs/<job_id>', methods=['GET'])
+async def get_syllabus_job(job_id):
+    job = await asyncio.to_thread(syllabus_jobs.get, job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job id"}), 404
+    return jsonify(job)
+
+# ----------------------------------------------
+# ROUTE: Syllabus job events
+# Endpoint: /syllabus/jobs/<job_id>/events
+# Method: GET
+# Description: Async version of app.syllabus_job_events() (Server-Sent Events).
+# ----------------------------------------------
+@app.route('/syllabus/jobs/<job_id>/events', methods=['GET'])
+async def syllabus_job_events(job_id):
+    if await asyncio.to_thread(syllabus_jobs.get, job_id) is None:
+        return jsonify({"error": "Unknown job id"}), 404
+
+    async def event_stream():
+        last_status = None
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + 300
+        while loop.time() < deadline:
+            job = await asyncio.to_thread(syllabus_jobs.get, job_id)
+            if job is None:
+                yield format_sse({"error": "Unknown job id"}, event="failed")
+                return
+            if job['status'] in ('done', 'failed'):
+                yield format_sse(job, event=job['status'])
+                return
+            if job['status'] != last_status:
+                last_status = job['status']
+                yield format_sse(job, event="status")
+            await asyncio.sleep(0.5)
+        yield format_sse({"error": "Timed out waiting for the syllabus"}, event="failed")
+
+    response = Response(event_stream(), mimetype='text/event-stream')
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    response.timeout = None
+    return response
+
+# ----------------------------------------------
+# Start the Quart development server (use hypercorn/uvicorn in production)
+# ----------------------------------------------
+if __name__ == '__main__':
+    app.run(host='127.0.0.1', port=5500, debug=True)
@@ -0,0 +1,84 @@
+# ----------------------------------------------
+# INDIC AI - Offline syllabus catalog builder
+# Description: Generates a syllabus for every (proficiency, language, purpose) combination
+# in the grid with bounded parallelism, retrying failed Cohere calls with exponential
+# backoff, and stores the results in the catalog served by app.py.
+#
+# Usage (from the AI/ directory):
+#   python build_syllabus_catalog.py
+#   python build_syllabus_catalog.py --languages Hindi Marathi --purposes travel --workers 2
+# ----------------------------------------------
+
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import product
+
+from app import SYLLABUS_CATALOG_DIR, generate_syllabus
+from syllabus_catalog import SyllabusCatalog
+
+# Default grid: the proficiency levels and purposes offered by the chat workflow,
+# and the Indic languages taught on the platform
+PROFICIENCIES = ["beginner", "intermediate", "advanced"]
+LANGUAGES = ["Hindi", "Marathi", "Bengali", "Gujarati", "Punjabi", "Tamil", "Telugu", "Kannada", "Malayalam"]
+PURPOSES = ["travel", "business", "general", "general knowledge"]
+
+# ----------------------------------------------
+# FUNCTION: Generate one syllabus, retrying with exponential backoff and jitter
+# Returns:
+# - list: The structured syllabus (raises after the last failed attempt).
+# ----------------------------------------------
+def generate_with_retry(proficiency, language, purpose, retries, backoff):
+    for attempt in range(retries + 1):
+        try:
+            syllabus = generate_syllabus(proficiency, language, purpose)
+            if not syllabus:
+                raise ValueError("Cohere output could not be parsed into exchanges")
+            return syllabus
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+            print(f"[retry {attempt + 1}/{retries}] {proficiency}/{language}/{purpose}: {e} (waiting {delay:.1f}s)")
+            time.sleep(delay)
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate the syllabus catalog.")
+    parser.add_argument("--proficiencies", nargs="+", default=PROFICIENCIES)
+    parser.add_argument("--languages", nargs="+", default=LANGUAGES)
+    parser.add_argument("--purposes", nargs="+", default=PURPOSES)
+    parser.add_argument("--catalog-dir", default=SYLLABUS_CATALOG_DIR)
+    parser.add_argument("--workers", type=int, default=4, help="Maximum concurrent Cohere calls")
+    parser.add_argument("--retries", type=int, default=3, help="Retries per combination after the first attempt")
+    parser.add_argument("--backoff", type=float, default=2.0, help="Initial backoff in seconds")
+    parser.add_argument("--force", action="store_true", help="Regenerate entries already in the catalog")
+    args = parser.parse_args()
+
+    catalog = SyllabusCatalog(args.catalog_dir)
+    grid = [
+        params for params in product(args.proficiencies, args.languages, args.purposes)
+        if args.force or params not in catalog
+    ]
+    print(f"Generating {len(grid)} syllabi into {args.catalog_dir} with {args.workers} workers...")
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            executor.submit(generate_with_retry, *params, args.retries, args.backoff): params
+            for params in grid
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            params = futures[future]
+            try:
+                catalog.add(*params, future.result())
+                print(f"[{done}/{len(grid)}] {'/'.join(params)}")
+            except Exception as e:
+                failed.append(params)
+                print(f"[{done}/{len(grid)}] FAILED {'/'.join(params)}: {e}")
+
+    print(f"Done. Catalog has {catalog.stats()['entries']} entries; {len(failed)} failed.")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
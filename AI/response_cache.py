@@ -0,0 +1,170 @@
+# ----------------------------------------------
+# INDIC AI - Semantic response cache
+# Description: Serves repeated or near-duplicate chat questions ("how do I say hello in Hindi",
+# "How do I say hello in Hindi?") from memory instead of another Groq round trip.
+# Messages are normalized, turned into hashed character n-gram vectors and matched by
+# cosine similarity through a small inverted index. Runs fully locally, no network needed.
+# Character n-grams can't tell "i am happy" from "i am not happy", so a near-duplicate is only
+# reused when both messages also share the same key tokens (negations, numbers, languages).
+# ----------------------------------------------
+
+import math
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict, defaultdict
+
+# ----------------------------------------------
+# FUNCTION: Normalize a chat message for caching
+# Lower-cases, drops punctuation and collapses whitespace.
+# ----------------------------------------------
+def normalize_message(message):
+    message = re.sub(r"[^\w\s]", " ", message.lower())
+    return " ".join(message.split())
+
+# Words whose presence changes the answer even though they barely change the n-grams
+NEGATIONS = {
+    "not", "no", "never", "none", "nothing", "nobody", "neither", "nor", "without", "cannot",
+    "dont", "doesnt", "didnt", "isnt", "arent", "wasnt", "werent", "cant", "couldnt", "wont",
+    "wouldnt", "shouldnt", "havent", "hasnt", "t"  # "don't" normalizes to "don t"
+}
+LANGUAGES = {
+    "hindi", "marathi", "tamil", "telugu", "bengali", "bangla", "gujarati", "kannada", "malayalam",
+    "punjabi", "odia", "oriya", "urdu", "assamese", "sanskrit", "konkani", "nepali", "sindhi",
+    "kashmiri", "english", "french", "german", "spanish", "japanese", "chinese", "arabic"
+}
+
+# ----------------------------------------------
+# FUNCTION: Key tokens of a normalized message
+# Returns:
+# - frozenset: Negations, numbers and language names in the message. Near-duplicates
+#   are only reused when these match exactly.
+# ----------------------------------------------
+def key_tokens(text):
+    return frozenset(token for token in text.split()
+                     if token in NEGATIONS or token in LANGUAGES or any(c.isdigit() for c in token))
+
+# ----------------------------------------------
+# FUNCTION: Vectorize a normalized message
+# Parameters:
+# - text (str): Normalized message.
+# - ngram (int): Character n-gram size.
+# - n_features (int): Size of the hashing space.
+# Returns:
+# - dict: Sparse, L2-normalized {feature: weight} vector.
+# ----------------------------------------------
+def vectorize(text, ngram=3, n_features=1 << 18):
+    padded = f" {text} "
+    counts = defaultdict(float)
+    for i in range(max(len(padded) - ngram + 1, 1)):
+        gram = padded[i:i + ngram]
+        # crc32 rather than hash() so the features are stable across processes
+        counts[zlib.crc32(gram.encode("utf-8")) % n_features] += 1.0
+
+    norm = math.sqrt(sum(w * w for w in counts.values()))
+    return {feature: w / norm for feature, w in counts.items()}
+
+# ----------------------------------------------
+# CLASS: In-memory semantic cache with LRU/TTL eviction
+# Parameters:
+# - threshold (float): Minimum cosine similarity for a near-duplicate hit (1.0 = exact only).
+#   Near-duplicates must also have the same key_tokens().
+# - max_entries (int): Maximum number of cached replies.
+# - ttl_seconds (float): Lifetime of an entry; 0 disables expiry.
+# ----------------------------------------------
+class SemanticResponseCache:
+    def __init__(self, threshold=0.9, max_entries=1000, ttl_seconds=24 * 3600):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()        # normalized message -> (vector, reply, created_at, key tokens)
+        self._postings = defaultdict(set)    # feature -> normalized messages containing it
+        self._lock = threading.Lock()
+
+    # Return a cached reply for the message, or None on a miss
+    def get(self, message):
+        key = normalize_message(message)
+        if not key:
+            return None
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._expired(entry, now):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+            best_key, best_score = self._nearest(vectorize(key), key_tokens(key), now)
+            if best_key is not None and best_score >= self.threshold:
+                self._entries.move_to_end(best_key)
+                self.hits += 1
+                self.near_hits += 1
+                return self._entries[best_key][1]
+
+            self.misses += 1
+            return None
+
+    # Cache a reply for the message
+    def put(self, message, reply):
+        key = normalize_message(message)
+        if not key:
+            return
+        vector = vectorize(key)
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (vector, reply, time.time(), key_tokens(key))
+            for feature in vector:
+                self._postings[feature].add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "near_duplicate_hits": self.near_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "threshold": self.threshold
+            }
+
+    # Score every cached message sharing at least one n-gram and all key tokens with the query
+    def _nearest(self, vector, tokens, now):
+        scores = defaultdict(float)
+        for feature, weight in vector.items():
+            for key in self._postings.get(feature, ()):
+                scores[key] += weight * self._entries[key][0][feature]
+
+        best_key, best_score = None, 0.0
+        expired = []
+        for key, score in scores.items():
+            if self._expired(self._entries[key], now):
+                expired.append(key)
+            elif score > best_score and self._entries[key][3] == tokens:
+                best_key, best_score = key, score
+        for key in expired:
+            self._remove(key)
+        return best_key, best_score
+
+    def _expired(self, entry, now):
+        return bool(self.ttl_seconds) and now - entry[2] > self.ttl_seconds
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for feature in entry[0]:
+            keys = self._postings.get(feature)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[feature]
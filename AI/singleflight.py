@@ -0,0 +1,86 @@
+# ----------------------------------------------
+# INDIC AI - Request coalescing (single-flight)
+# Description: When several identical requests are in flight at the same time, only the
+# first one (the "leader") calls the upstream LLM; the others wait for it and share its
+# result or its exception. SingleFlight is for threaded servers (Flask), AsyncSingleFlight
+# for the asyncio server. Both count how many requests were coalesced.
+# ----------------------------------------------
+
+import asyncio
+import threading
+
+# One in-flight call shared by the leader and its followers
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+# ----------------------------------------------
+# CLASS: Thread-based single-flight group
+# ----------------------------------------------
+class SingleFlight:
+    def __init__(self):
+        self.calls = 0       # Upstream calls actually made
+        self.coalesced = 0   # Requests served by another request's call
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    # Run fn(*args, **kwargs) unless a call with the same key is already in flight
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._in_flight.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._in_flight[key] = _Call()
+                self.calls += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._in_flight)}
+
+# ----------------------------------------------
+# CLASS: asyncio single-flight group
+# ----------------------------------------------
+class AsyncSingleFlight:
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._in_flight = {}
+
+    # Await coro_fn(*args, **kwargs) unless a call with the same key is already in flight
+    async def do(self, key, coro_fn, *args, **kwargs):
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # shield: a cancelled follower must not cancel the leader's call
+            return await asyncio.shield(future)
+
+        self.calls += 1
+        future = asyncio.ensure_future(coro_fn(*args, **kwargs))
+        self._in_flight[key] = future
+        future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(future)
+
+    def stats(self):
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._in_flight)}
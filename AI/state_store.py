@@ -0,0 +1,147 @@
+# ----------------------------------------------
+# INDIC AI - Conversation state stores
+# Description: Bounded key/value stores for per-user workflow state (and other short-lived
+# records). Every entry has a TTL so abandoned conversations are eventually dropped.
+# - MemoryStateStore: in-process LRU, for a single worker.
+# - SQLiteStateStore: a local SQLite file shared by every worker process on the machine,
+#   so /chat can run under several gunicorn workers.
+# ----------------------------------------------
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# ----------------------------------------------
+# CLASS: In-memory LRU state store
+# Parameters:
+# - max_entries (int): Maximum number of entries; the least recently used is evicted first.
+# - ttl_seconds (float): Idle lifetime of an entry; 0 disables expiry.
+# ----------------------------------------------
+class MemoryStateStore:
+    def __init__(self, max_entries=10000, ttl_seconds=3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] is not None and entry[1] < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            # Hand out a copy so callers must set() to persist changes, as with SQLite
+            return json.loads(json.dumps(entry[0]))
+
+    def set(self, key, value):
+        expires_at = time.time() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._entries[key] = (json.loads(json.dumps(value)), expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+# ----------------------------------------------
+# CLASS: SQLite-backed state store shared between processes
+# Parameters:
+# - db_path (str): Location of the SQLite file (created if missing).
+# - namespace (str): Table name, so several stores can share one file.
+# - max_entries (int): Maximum number of entries; the least recently updated is evicted first.
+# - ttl_seconds (float): Idle lifetime of an entry; 0 disables expiry.
+# ----------------------------------------------
+class SQLiteStateStore:
+    def __init__(self, db_path, namespace="chat_states", max_entries=10000, ttl_seconds=3600):
+        if not namespace.isidentifier():
+            raise ValueError(f"Invalid state store namespace: {namespace!r}")
+        self.db_path = db_path
+        self.table = namespace
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        folder = os.path.dirname(db_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " updated_at REAL NOT NULL,"
+                " expires_at REAL)"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_updated ON {self.table} (updated_at)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key):
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT value FROM {self.table} WHERE key = ? AND (expires_at IS NULL OR expires_at >= ?)",
+                (key, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, value):
+        now = time.time()
+        expires_at = now + self.ttl_seconds if self.ttl_seconds else None
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, expires_at)
+            )
+            # Expired rows and rows beyond the size bound are purged on write
+            conn.execute(f"DELETE FROM {self.table} WHERE expires_at < ?", (now,))
+            if self.max_entries:
+                conn.execute(
+                    f"DELETE FROM {self.table} WHERE key IN ("
+                    f" SELECT key FROM {self.table} ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+
+    def delete(self, key):
+        with self._connect() as conn:
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def __len__(self):
+        with self._connect() as conn:
+            return conn.execute(
+                f"SELECT COUNT(*) FROM {self.table} WHERE expires_at IS NULL OR expires_at >= ?", (time.time(),)
+            ).fetchone()[0]
+
+# ----------------------------------------------
+# FUNCTION: Create a state store from configuration
+# Parameters:
+# - backend (str): "memory" or "sqlite".
+# - namespace (str): Logical name of the store (SQLite table name).
+# - db_path (str): SQLite file, used by the "sqlite" backend only.
+# - max_entries (int), ttl_seconds (float): Bounds, as for the store classes.
+# ----------------------------------------------
+def create_state_store(backend, namespace, db_path, max_entries, ttl_seconds):
+    if backend == "memory":
+        return MemoryStateStore(max_entries=max_entries, ttl_seconds=ttl_seconds)
+    if backend == "sqlite":
+        return SQLiteStateStore(db_path, namespace=namespace, max_entries=max_entries, ttl_seconds=ttl_seconds)
+    raise ValueError(f"Unknown state store backend: {backend!r} (expected 'memory' or 'sqlite')")
@@ -0,0 +1,133 @@
+# ----------------------------------------------
+# INDIC AI - Persistent syllabus cache
+# Description: Stores generated syllabi in SQLite, keyed on a hash of the normalized
+# (proficiency, language, purpose) triple, so that popular combinations are served
+# without another Cohere generation. Entries are evicted by TTL and, once the cache
+# is full, least-recently-used first.
+# ----------------------------------------------
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+# ----------------------------------------------
+# FUNCTION: Normalize one syllabus parameter
+# Lower-cases and collapses whitespace so "Hindi " and "hindi" share a cache entry.
+# ----------------------------------------------
+def normalize_param(value):
+    return " ".join(str(value).lower().split())
+
+# ----------------------------------------------
+# FUNCTION: Build the content-addressed cache key for a syllabus request
+# Returns:
+# - str: sha256 hex digest of the normalized triple.
+# ----------------------------------------------
+def syllabus_cache_key(proficiency, language, purpose):
+    normalized = "\x1f".join(normalize_param(v) for v in (proficiency, language, purpose))
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+# ----------------------------------------------
+# CLASS: SQLite-backed syllabus cache with TTL and LRU eviction
+# Parameters:
+# - db_path (str): Location of the SQLite file (created if missing).
+# - max_entries (int): Maximum number of cached syllabi; 0 disables the size bound.
+# - ttl_seconds (float): Lifetime of an entry; 0 disables expiry.
+# Safe to share between threads and between processes using the same file.
+# ----------------------------------------------
+class SyllabusCache:
+    def __init__(self, db_path, max_entries=500, ttl_seconds=7 * 24 * 3600):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        folder = os.path.dirname(db_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS syllabus_cache ("
+                " key TEXT PRIMARY KEY,"
+                " proficiency TEXT NOT NULL,"
+                " language TEXT NOT NULL,"
+                " purpose TEXT NOT NULL,"
+                " syllabus TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS syllabus_cache_lru ON syllabus_cache (last_access)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")  # Readers don't block the writer
+            with conn:  # Commit on success, roll back on error
+                yield conn
+        finally:
+            conn.close()
+
+    # Return the cached syllabus for the triple, or None on a miss
+    def get(self, proficiency, language, purpose):
+        key = syllabus_cache_key(proficiency, language, purpose)
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT syllabus, created_at FROM syllabus_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM syllabus_cache WHERE key = ?", (key,))
+                row = None
+            if row is not None:
+                conn.execute("UPDATE syllabus_cache SET last_access = ? WHERE key = ?", (now, key))
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    # Store a syllabus for the triple and apply the eviction policy
+    def put(self, proficiency, language, purpose, syllabus):
+        key = syllabus_cache_key(proficiency, language, purpose)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO syllabus_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, normalize_param(proficiency), normalize_param(language), normalize_param(purpose),
+                 json.dumps(syllabus, ensure_ascii=False, separators=(",", ":")), now, now)
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn, now):
+        if self.ttl_seconds:
+            conn.execute("DELETE FROM syllabus_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        if self.max_entries:
+            # Drop the least recently used rows beyond the size bound
+            conn.execute(
+                "DELETE FROM syllabus_cache WHERE key IN ("
+                " SELECT key FROM syllabus_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    # Hit/miss counters for this process, plus the current number of entries
+    def stats(self):
+        with self._connect() as conn:
+            size = conn.execute("SELECT COUNT(*) FROM syllabus_cache").fetchone()[0]
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": size,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds
+            }
@@ -0,0 +1,95 @@
+# ----------------------------------------------
+# INDIC AI - Pre-generated syllabus catalog
+# Description: A folder of syllabi generated ahead of time (see build_syllabus_catalog.py)
+# with an index.json mapping each normalized (proficiency, language, purpose) triple to its
+# file. The chat app loads the whole catalog into memory at startup and serves matching
+# requests from it without any LLM call.
+# ----------------------------------------------
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+from syllabus_cache import normalize_param, syllabus_cache_key
+
+INDEX_FILE = "index.json"
+
+# ----------------------------------------------
+# FUNCTION: Atomically write JSON to a file (write to a temp file, then rename)
+# ----------------------------------------------
+def write_json_atomic(path, data):
+    folder = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+# ----------------------------------------------
+# CLASS: Syllabus catalog
+# Parameters:
+# - folder (str): Catalog directory holding index.json and one JSON file per entry.
+# ----------------------------------------------
+class SyllabusCatalog:
+    def __init__(self, folder):
+        self.folder = folder
+        self.hits = 0
+        self._index = {}     # key -> index entry
+        self._syllabi = {}   # key -> syllabus
+        self._lock = threading.Lock()
+        self.reload()
+
+    # (Re)load index.json and every catalog entry into memory
+    def reload(self):
+        index_path = os.path.join(self.folder, INDEX_FILE)
+        index, syllabi = {}, {}
+        if os.path.exists(index_path):
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            for key, entry in index.items():
+                try:
+                    with open(os.path.join(self.folder, entry['file']), 'r', encoding='utf-8') as f:
+                        syllabi[key] = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"Skipping catalog entry {entry.get('file')}: {e}")
+        with self._lock:
+            self._index, self._syllabi = index, syllabi
+
+    # Return the catalog syllabus for the triple, or None if it isn't in the catalog
+    def get(self, proficiency, language, purpose):
+        key = syllabus_cache_key(proficiency, language, purpose)
+        with self._lock:
+            syllabus = self._syllabi.get(key)
+            if syllabus is not None:
+                self.hits += 1
+            return syllabus
+
+    def __contains__(self, params):
+        with self._lock:
+            return syllabus_cache_key(*params) in self._syllabi
+
+    # Write a syllabus into the catalog and update index.json
+    def add(self, proficiency, language, purpose, syllabus):
+        key = syllabus_cache_key(proficiency, language, purpose)
+        entry = {
+            "file": f"{key[:16]}.json",
+            "proficiency": normalize_param(proficiency),
+            "language": normalize_param(language),
+            "purpose": normalize_param(purpose),
+            "createdAt": time.time()
+        }
+        os.makedirs(self.folder, exist_ok=True)
+        write_json_atomic(os.path.join(self.folder, entry['file']), syllabus)
+        with self._lock:
+            self._index[key] = entry
+            self._syllabi[key] = syllabus
+            write_json_atomic(os.path.join(self.folder, INDEX_FILE), self._index)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._index), "hits": self.hits}
@@ -0,0 +1,84 @@
+# ----------------------------------------------
+# INDIC AI - Incremental syllabus parser
+# Description: Turns Cohere's "Teacher: ... Student: ..." script into structured exchanges
+# while the text is still streaming in. Each exchange is emitted as soon as the next
+# "Teacher:" marker (or the end of the stream) shows it is complete. Feeding the whole
+# text at once gives exactly the same result as the original split-based parsing.
+#
+# Usage:
+#   parser = SyllabusStreamParser()
+#   for chunk in chunks:
+#       for exchange in parser.feed(chunk):
+#           ...
+#   for exchange in parser.close():
+#       ...
+# ----------------------------------------------
+
+TEACHER_MARKER = "Teacher:"
+STUDENT_MARKER = "Student:"
+
+# ----------------------------------------------
+# FUNCTION: Parse the text between two "Teacher:" markers into one exchange
+# Returns:
+# - dict | None: The structured exchange, or None if there is no student part.
+# ----------------------------------------------
+def parse_exchange(segment):
+    lines = segment.strip().split(STUDENT_MARKER) # Split each exchange into teacher and student parts
+    if len(lines) < 2: # Ensure both teacher and student parts are present
+        return None
+    return {
+        "text": lines[0].strip(),
+        "expected": lines[1].strip(),
+        "english": "", # Placeholder for potential future translation
+        "animation": "" # Placeholder for potential future animation cues
+    }
+
+# ----------------------------------------------
+# CLASS: Teacher/Student state machine over a text stream
+# ----------------------------------------------
+class SyllabusStreamParser:
+    def __init__(self):
+        self._buffer = ""   # Text of the exchange currently being received
+        self._scanned = 0   # Buffer prefix already searched for a marker
+        self.closed = False
+
+    # Add a chunk of generated text; returns the exchanges it completed
+    def feed(self, chunk):
+        if self.closed:
+            raise ValueError("Cannot feed a closed parser")
+        self._buffer += chunk
+        completed = []
+
+        while True:
+            # A marker may straddle two chunks, so re-check the last few scanned characters
+            start = max(self._scanned - len(TEACHER_MARKER) + 1, 0)
+            index = self._buffer.find(TEACHER_MARKER, start)
+            if index == -1:
+                self._scanned = len(self._buffer)
+                return completed
+
+            exchange = parse_exchange(self._buffer[:index])
+            if exchange is not None:
+                completed.append(exchange)
+            self._buffer = self._buffer[index + len(TEACHER_MARKER):]
+            self._scanned = 0
+
+    # Mark the end of the stream; returns the final exchange, if complete
+    def close(self):
+        if self.closed:
+            return []
+        self.closed = True
+        exchange = parse_exchange(self._buffer)
+        self._buffer = ""
+        return [exchange] if exchange is not None else []
+
+# ----------------------------------------------
+# FUNCTION: Parse a complete generated script
+# Parameters:
+# - output_text (str): The raw generated text.
+# Returns:
+# - list: A list of dictionaries, each representing a structured exchange in the syllabus.
+# ----------------------------------------------
+def parse_syllabus_text(output_text):
+    parser = SyllabusStreamParser()
+    return parser.feed(output_text) + parser.close()
@@ -0,0 +1,127 @@
+# ----------------------------------------------
+# INDIC AI - Indexed syllabus storage
+# Description: Saves every generated syllabus as a minified JSON file (written atomically)
+# and records it in a SQLite manifest mapping id -> file, user, parameters and creation
+# time. Syllabi are looked up by id through the manifest's primary key, so serving one
+# never needs a directory listing.
+# ----------------------------------------------
+
+import glob
+import json
+import os
+import random
+import re
+import sqlite3
+import string
+import time
+from contextlib import contextmanager
+
+from syllabus_catalog import write_json_atomic
+
+MANIFEST_FILE = "manifest.sqlite3"
+ID_PATTERN = re.compile(r"^[A-Za-z0-9]{8}$")
+
+# ----------------------------------------------
+# CLASS: Syllabus store
+# Parameters:
+# - folder (str): Directory holding the syllabus files and the manifest.
+# ----------------------------------------------
+class SyllabusStore:
+    def __init__(self, folder):
+        self.folder = folder
+        self.manifest_path = os.path.join(folder, MANIFEST_FILE)
+        os.makedirs(folder, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS syllabi ("
+                " id TEXT PRIMARY KEY,"
+                " file TEXT NOT NULL,"
+                " user_id TEXT,"
+                " proficiency TEXT,"
+                " language TEXT,"
+                " purpose TEXT,"
+                " created_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS syllabi_user ON syllabi (user_id, created_at)")
+        self.import_existing()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.manifest_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # Index syllabus_<id>.json files written before the manifest existed
+    def import_existing(self):
+        with self._connect() as conn:
+            known = {row['file'] for row in conn.execute("SELECT file FROM syllabi")}
+            for path in glob.glob(os.path.join(self.folder, "syllabus_*.json")):
+                file_name = os.path.basename(path)
+                syllabus_id = file_name[len("syllabus_"):-len(".json")]
+                if file_name not in known and ID_PATTERN.match(syllabus_id):
+                    conn.execute(
+                        "INSERT OR IGNORE INTO syllabi (id, file, created_at) VALUES (?, ?, ?)",
+                        (syllabus_id, file_name, os.path.getmtime(path))
+                    )
+
+    # Save a syllabus and return its manifest record
+    def save(self, syllabus, user_id=None, syllabus_data=None):
+        syllabus_data = syllabus_data or {}
+        with self._connect() as conn:
+            # Same 8-character ids as the original random file names; retry on the rare clash
+            while True:
+                syllabus_id = ''.join(random.choices(string.ascii_letters + string.digits, k=8))
+                if conn.execute("SELECT 1 FROM syllabi WHERE id = ?", (syllabus_id,)).fetchone() is None:
+                    break
+
+            record = {
+                "id": syllabus_id,
+                "file": f"syllabus_{syllabus_id}.json",
+                "user_id": user_id,
+                "proficiency": syllabus_data.get('proficiency'),
+                "language": syllabus_data.get('language'),
+                "purpose": syllabus_data.get('purpose'),
+                "created_at": time.time()
+            }
+            # The file is in place before the manifest row commits, so an indexed id is always readable
+            write_json_atomic(os.path.join(self.folder, record['file']), syllabus)
+            conn.execute(
+                "INSERT INTO syllabi VALUES (:id, :file, :user_id, :proficiency, :language, :purpose, :created_at)",
+                record
+            )
+        return record
+
+    # Return the manifest record for an id, or None
+    def get_record(self, syllabus_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM syllabi WHERE id = ?", (syllabus_id,)).fetchone()
+        return dict(row) if row else None
+
+    # Return the syllabus for an id, or None
+    def get(self, syllabus_id):
+        record = self.get_record(syllabus_id)
+        if record is None:
+            return None
+        try:
+            with open(os.path.join(self.folder, record['file']), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    # Path of the stored file for a record
+    def path(self, record):
+        return os.path.join(self.folder, record['file'])
+
+    # Most recent manifest records, optionally for a single user
+    def list(self, user_id=None, limit=50):
+        query, args = "SELECT * FROM syllabi", []
+        if user_id is not None:
+            query, args = query + " WHERE user_id = ?", [user_id]
+        with self._connect() as conn:
+            rows = conn.execute(query + " ORDER BY created_at DESC LIMIT ?", args + [limit]).fetchall()
+        return [dict(row) for row in rows]
@@ -0,0 +1,59 @@
+# ----------------------------------------------
+# INDIC AI - Syllabus parser tests
+# Description: Feeding a recorded Cohere transcript to SyllabusStreamParser in random
+# chunks must give the same exchanges as parsing the whole text at once.
+# Run with:  python -m pytest AI/tests
+# ----------------------------------------------
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from syllabus_parser import SyllabusStreamParser, parse_syllabus_text
+
+TRANSCRIPT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'generated_syllabus_transcript.txt')
+
+# Split text into chunks of 1..max_size characters
+def random_chunks(text, rng, max_size):
+    chunks = []
+    position = 0
+    while position < len(text):
+        size = rng.randint(1, max_size)
+        chunks.append(text[position:position + size])
+        position += size
+    return chunks
+
+class SyllabusStreamParserTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(TRANSCRIPT_PATH, encoding='utf-8') as f:
+            cls.transcript = f.read()
+        cls.expected = parse_syllabus_text(cls.transcript)
+
+    def test_transcript_parses(self):
+        self.assertEqual(len(self.expected), 6)  # The exchange without a "Student:" line is skipped
+        self.assertEqual(self.expected[1]["expected"], "मेरा नाम Alex है। (Mera naam Alex hai.)")
+
+    def test_random_chunks_match_whole_text(self):
+        for seed in range(200):
+            rng = random.Random(seed)
+            chunks = random_chunks(self.transcript, rng, rng.choice([1, 3, 8, 32, 256]))
+            parser = SyllabusStreamParser()
+            exchanges = []
+            for chunk in chunks:
+                exchanges.extend(parser.feed(chunk))
+            exchanges.extend(parser.close())
+            self.assertEqual(exchanges, self.expected, f"seed {seed}")
+
+    def test_exchanges_complete_before_close(self):
+        parser = SyllabusStreamParser()
+        exchanges = []
+        for chunk in random_chunks(self.transcript, random.Random(0), 16):
+            exchanges.extend(parser.feed(chunk))
+        self.assertEqual(exchanges, self.expected[:-1])  # Only the last one waits for close()
+        self.assertEqual(parser.close(), self.expected[-1:])
+
+if __name__ == '__main__':
+    unittest.main()
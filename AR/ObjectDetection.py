@@ -1,158 +1,292 @@
 # Import necessary libraries
-from flask import Flask, Response, jsonify  # For building the web API
+from flask import Flask, Response, jsonify, request  # For building the web API
 from flask_cors import CORS  # To allow cross-origin requests (for frontend-backend communication)
 import cv2  # OpenCV for working with camera and image processing
-from transformers import DetrImageProcessor, DetrForObjectDetection  # For object detection using pre-trained DETR model
 from PIL import Image  # To convert OpenCV image to PIL format
-import torch  # PyTorch for handling tensors
-from gtts import gTTS  # Google Text-to-Speech for generating audio
-from playsound import playsound  # To play audio output
-from threading import Thread  # To run tasks in parallel (like audio)
+from threading import Thread  # To pre-generate audio in the background
 import os  # For interacting with the operating system
-import time  # For managing time-based operations
-from deep_translator import GoogleTranslator  # To translate text to Hindi
-
-# Initialize translator with auto-detect source language and Hindi as target
-translator = GoogleTranslator(source='auto', target='hi')
+from label_translations import LabelTranslations  # Precomputed label translations
+from announcer import Announcer, GTTSSynthesizer, PLAYERS  # Queued, cached spoken announcements
+from pipeline import StreamSource, BatchedDetectionWorker  # Capture threads and batched inference
+from scheduler import DetectionScheduler  # Decides which frames are worth running the model on
+from tracker import IoUTracker  # Stable track ids and boxes between inferences
+from encoder import StreamEncoder  # Configurable JPEG encoding for the MJPEG stream
+from broadcast import BroadcastHub  # Draws and encodes each frame once for all viewers
+from detectors import create_detector  # Pluggable detector backends (DETR, int8, ONNX, YOLOS)
+from runtime import configure_torch, warm_up  # Thread tuning and start-up warm-up
 
 # Create the Flask app
 app = Flask(__name__)
 CORS(app)  # Enable Cross-Origin Resource Sharing
 
 # Initialize global variables
-camera = None  # This will hold the camera object
-is_streaming = False  # Flag to control the stream status
-last_detection_time = {}  # Dictionary to remember when an object was last announced
-
-# Load object detection model and processor
-print("Loading models... This may take a few moments.")
-processor = DetrImageProcessor.from_pretrained("facebook/detr-resnet-50", revision="no_timm")
-model = DetrForObjectDetection.from_pretrained("facebook/detr-resnet-50", revision="no_timm")
+detector_worker = None  # Batched inference thread shared by all sources
+
+# Multiple sources (cameras, video files or stream URLs) are identified by id, e.g.
+# /start?source=room2&uri=1 or /start?source=lecture&uri=rtsp://...; without parameters
+# the default source opens webcam 0 as before.
+DEFAULT_SOURCE = 'default'
+MAX_SOURCES = int(os.environ.get('MAX_SOURCES', 8))
+
+# Batching: frames from all active sources share one forward pass
+DETECTION_MAX_BATCH = int(os.environ.get('DETECTION_MAX_BATCH', 4))
+DETECTION_MAX_LATENCY_MS = float(os.environ.get('DETECTION_MAX_LATENCY_MS', 50))  # Wait for a fuller batch
+
+# Detection scheduling (see scheduler.py)
+# DETECTION_POLICY: always | every_n | rate | motion
+DETECTION_POLICY = os.environ.get('DETECTION_POLICY', 'motion')
+DETECTION_EVERY_N = int(os.environ.get('DETECTION_EVERY_N', 5))  # For "every_n"
+DETECTION_TARGET_FPS = float(os.environ.get('DETECTION_TARGET_FPS', 2.0))  # For "rate"
+DETECTION_MOTION_THRESHOLD = float(os.environ.get('DETECTION_MOTION_THRESHOLD', 8.0))  # For "motion"
+DETECTION_MAX_INTERVAL = float(os.environ.get('DETECTION_MAX_INTERVAL', 2.0))  # Forced refresh, seconds
+
+# Tracking (see tracker.py): each object is announced once per track, with a per-label cooldown as a backstop
+TRACKER_MIN_IOU = float(os.environ.get('TRACKER_MIN_IOU', 0.3))
+TRACKER_MAX_MISSES = int(os.environ.get('TRACKER_MAX_MISSES', 2))  # Inferences in a row that may miss an object
+TRACKER_ANNOUNCE_COOLDOWN = float(os.environ.get('TRACKER_ANNOUNCE_COOLDOWN', 5.0))  # Seconds between new tracks of a label
+TRACKER_SMOOTHING = float(os.environ.get('TRACKER_SMOOTHING', 0.6))  # 1 disables box smoothing
+
+# Stream encoding (see encoder.py)
+STREAM_SCALE = float(os.environ.get('STREAM_SCALE', 1.0))  # Output size relative to the camera frame
+STREAM_JPEG_QUALITY = int(os.environ.get('STREAM_JPEG_QUALITY', 80))
+STREAM_JPEG_BACKEND = os.environ.get('STREAM_JPEG_BACKEND', 'auto')  # auto | turbojpeg | opencv
+STREAM_ADAPTIVE_QUALITY = os.environ.get('STREAM_ADAPTIVE_QUALITY', '1') == '1'
+STREAM_TARGET_FPS = float(os.environ.get('STREAM_TARGET_FPS', 15.0))  # For adaptive quality
+STREAM_CLIENT_BUFFER = int(os.environ.get('STREAM_CLIENT_BUFFER', 2))  # Frames buffered per viewer before dropping
+
+# Load the object detection backend (see detectors.py)
+# DETECTOR_BACKEND: detr | detr-int8 | detr-onnx | yolos-tiny
+DETECTOR_BACKEND = os.environ.get('DETECTOR_BACKEND', 'detr')
+DETECTOR_ONNX_PATH = os.environ.get('DETECTOR_ONNX_PATH', 'detr-resnet-50.onnx')  # For "detr-onnx"
+
+# Inference runtime settings (see runtime.py); 0 threads keeps the PyTorch default
+TORCH_NUM_THREADS = int(os.environ.get('TORCH_NUM_THREADS', 0))
+TORCH_INTEROP_THREADS = int(os.environ.get('TORCH_INTEROP_THREADS', 0))
+DETECTOR_CHANNELS_LAST = os.environ.get('DETECTOR_CHANNELS_LAST', '0') == '1'
+DETECTOR_COMPILE = os.environ.get('DETECTOR_COMPILE', '0') == '1'
+DETECTOR_WARMUP_RUNS = int(os.environ.get('DETECTOR_WARMUP_RUNS', 2))
+
+torch_threads = configure_torch(TORCH_NUM_THREADS, TORCH_INTEROP_THREADS)
+
+print(f"Loading {DETECTOR_BACKEND} detector... This may take a few moments.")
+detector = create_detector(
+    DETECTOR_BACKEND,
+    **({"onnx_path": DETECTOR_ONNX_PATH} if DETECTOR_BACKEND == "detr-onnx" else {})
+)
+detector.optimize(channels_last=DETECTOR_CHANNELS_LAST, compile=DETECTOR_COMPILE)
 print("Models loaded successfully!")
 
-# Function to translate text to Hindi
-def translate_text(text):
-    try:
-        translation = translator.translate(text)
-        return translation
-    except Exception as e:
-        print(f"Translation error: {e}")
-        return text  # If translation fails, return the original text
+# Translate every label the detector can output once, so the frame loop never waits on a translator
+# TARGET_LANGUAGES: comma-separated language codes; the first one is drawn on the video
+TARGET_LANGUAGES = [lang.strip() for lang in os.environ.get('TARGET_LANGUAGES', 'hi').split(',') if lang.strip()]
+label_translations = LabelTranslations(
+    TARGET_LANGUAGES,
+    dictionary_path=os.environ.get('LABEL_DICTIONARY_PATH', os.path.join(os.path.dirname(__file__), 'label_dictionary.json')),
+    cache_path=os.environ.get('LABEL_TRANSLATION_CACHE', 'label_translations.json'),
+    online=os.environ.get('LABEL_TRANSLATE_ONLINE', '1') == '1'
+)
+label_translations.precompute(detector.id2label.values())
+print(f"Label translations ready: {label_translations.stats()['labels']}")
 
-# Function to play the translated audio using gTTS
-def play_audio(text):
-    try:
-        tts = gTTS(f"Yaha hai {text}", lang="hi")  # Convert text to Hindi speech
-        audio_file = "output.mp3"
-        tts.save(audio_file)  # Save the audio
-        playsound(audio_file)  # Play the audio
-        os.remove(audio_file)  # Delete the audio file after playing
-    except Exception as e:
-        print(f"Error in audio playback: {e}")
-
-# Function to continuously read frames from the camera and detect objects
-def generate_frames():
-    global camera, is_streaming, last_detection_time
-
-    while is_streaming:
-        success, frame = camera.read()  # Read a frame from the camera
-        if not success:
-            break  # Stop if frame cannot be read
-
-        try:
-            # Convert BGR image (OpenCV format) to RGB (PIL format)
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            image = Image.fromarray(rgb_frame)
-
-            # Prepare image for model
-            inputs = processor(images=image, return_tensors="pt")
-            outputs = model(**inputs)  # Run object detection
-
-            # Convert model output to readable format with a confidence threshold
-            target_sizes = torch.tensor([image.size[::-1]])
-            results = processor.post_process_object_detection(outputs, target_sizes=target_sizes, threshold=0.9)[0]
-
-            current_time = time.time()  # Capture current time for cooldown
-
-            # Loop through detected objects
-            for score, label, box in zip(results["scores"], results["labels"], results["boxes"]):
-                if score > 0.9:  # Only consider high-confidence detections
-                    label_name = model.config.id2label[label.item()]  # Get object name
-
-                    # Translate the detected label to Hindi
-                    translated_label = translate_text(label_name)
-
-                    # If object is not recently announced, play audio
-                    if label_name not in last_detection_time or \
-                       (current_time - last_detection_time[label_name]) > 5:  # 5 seconds cooldown
-                        Thread(target=play_audio, args=(translated_label,)).start()  # Speak in separate thread
-                        last_detection_time[label_name] = current_time  # Update last detection time
-
-                    # Draw bounding box on frame
-                    box = [round(i, 2) for i in box.tolist()]
-                    x_min, y_min, x_max, y_max = map(int, box)
-                    cv2.rectangle(frame, (x_min, y_min), (x_max, y_max), (0, 255, 0), 2)  # Green box
-                    cv2.putText(frame, translated_label, (x_min, y_min - 10),
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)  # Label above box
-
-            # Convert frame to JPEG format for video streaming
-            ret, buffer = cv2.imencode('.jpg', frame)
-            frame = buffer.tobytes()
-
-            # Return the frame as part of an HTTP response
-            yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
-
-        except Exception as e:
-            print(f"Error processing frame: {e}")
-            continue
-
-# Route to start the camera stream
+# Spoken announcements (see announcer.py)
+# AUDIO_BACKEND: playsound | null (null keeps the service silent, e.g. on a headless server)
+AUDIO_BACKEND = os.environ.get('AUDIO_BACKEND', 'playsound')
+AUDIO_CACHE_DIR = os.environ.get('AUDIO_CACHE_DIR', 'audio_cache')
+AUDIO_QUEUE_SIZE = int(os.environ.get('AUDIO_QUEUE_SIZE', 4))
+AUDIO_MAX_AGE = float(os.environ.get('AUDIO_MAX_AGE', 3.0))  # Skip announcements older than this, seconds
+AUDIO_PREGENERATE = os.environ.get('AUDIO_PREGENERATE', '0') == '1'  # Synthesise every label at startup
+ANNOUNCE_TEMPLATES = {"hi": "Yaha hai {label}"}  # Phrase per language; others just say the label
+
+announcer = Announcer(GTTSSynthesizer(), PLAYERS[AUDIO_BACKEND](), cache_dir=AUDIO_CACHE_DIR,
+                      max_queue=AUDIO_QUEUE_SIZE, max_age=AUDIO_MAX_AGE)
+announcer.start()
+
+# Function to build the spoken phrase for a label
+def announcement_text(translated_label, language):
+    return ANNOUNCE_TEMPLATES.get(language, "{label}").format(label=translated_label)
+
+if AUDIO_PREGENERATE:
+    Thread(target=announcer.pregenerate, daemon=True, args=([
+        (announcement_text(translated, TARGET_LANGUAGES[0]), TARGET_LANGUAGES[0])
+        for translated in label_translations.table().values()
+    ],)).start()
+
+# Warm up on a dummy frame so the first viewer doesn't pay for lazy initialisation
+if DETECTOR_WARMUP_RUNS > 0:
+    print(f"Warm-up finished in {warm_up(detector, DETECTOR_WARMUP_RUNS):.2f}s")
+
+# Function to translate a label to the display language (a lookup in the precomputed table)
+def translate_text(text, language=None):
+    return label_translations.get(text, language)
+
+# Function to run object detection on frames from several sources in one forward pass
+# Returns one list of detections per frame: (label_name, translated_label, score, (x_min, y_min, x_max, y_max))
+def detect_objects_batch(frames):
+    # Convert BGR images (OpenCV format) to RGB (PIL format)
+    images = [Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)) for frame in frames]
+
+    # Run object detection; results are post-processed with a confidence threshold
+    return [to_detections(results) for results in detector.detect_batch(images, threshold=0.9)]
+
+# Function to turn post-processed model output into detection tuples
+def to_detections(results):
+    detections = []
+    for score, label, box in zip(results["scores"], results["labels"], results["boxes"]):
+        if score > 0.9:  # Only consider high-confidence detections
+            label_name = detector.id2label[label.item()]  # Get object name
+            translated_label = translate_text(label_name)  # Translate the detected label (no I/O)
+            box = [round(i, 2) for i in box.tolist()]
+            detections.append((label_name, translated_label, score.item(), tuple(map(int, box))))
+    return detections
+
+# Function to announce objects that just appeared (tracks started by the latest inference)
+def announce_tracks(new_tracks):
+    language = TARGET_LANGUAGES[0]
+    for track in new_tracks:
+        announcer.announce(track.label_name, announcement_text(track.translated_label, language),
+                           language)  # Queued for the audio worker
+
+# Function to draw detections on a frame
+def draw_detections(frame, detections):
+    for label_name, translated_label, score, (x_min, y_min, x_max, y_max) in detections:
+        cv2.rectangle(frame, (x_min, y_min), (x_max, y_max), (0, 255, 0), 2)  # Green box
+        cv2.putText(frame, translated_label, (x_min, y_min - 10),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)  # Label above box
+
+# Function to draw a source's tracked boxes (extrapolated between inferences) on a frame
+def render_frame(source, frame):
+    draw_detections(frame, source.tracker.predict())
+
+# Function to create the stream encoder for a new source
+def create_encoder():
+    return StreamEncoder(scale=STREAM_SCALE, quality=STREAM_JPEG_QUALITY, backend=STREAM_JPEG_BACKEND,
+                         adaptive=STREAM_ADAPTIVE_QUALITY, target_fps=STREAM_TARGET_FPS)
+
+# Function to create a scheduler for a new source
+def create_scheduler():
+    return DetectionScheduler(
+        policy=DETECTION_POLICY,
+        every_n=DETECTION_EVERY_N,
+        target_fps=DETECTION_TARGET_FPS,
+        motion_threshold=DETECTION_MOTION_THRESHOLD,
+        max_interval=DETECTION_MAX_INTERVAL
+    )
+
+# Function to create a tracker for a new source
+def create_tracker():
+    return IoUTracker(min_iou=TRACKER_MIN_IOU, max_misses=TRACKER_MAX_MISSES, smoothing=TRACKER_SMOOTHING,
+                      announce_cooldown=TRACKER_ANNOUNCE_COOLDOWN)
+
+# Function to open a source: a webcam index ("0", "1", ...), a video file or a stream URL
+def open_capture(uri):
+    return cv2.VideoCapture(int(uri) if uri.isdigit() else uri)
+
+# Function to describe one source for /status
+def source_status(source):
+    return {
+        "is_streaming": source.running,
+        "camera_initialized": source.camera.isOpened(),
+        "inference_time": source.inference_time,
+        "scheduler": source.scheduler.stats(),
+        "tracker": source.tracker.stats(),
+        "stream": source.hub.stats()
+    }
+
+# Route to start a camera stream
 @app.route('/start')
 def start_stream():
-    global camera, is_streaming
+    global detector_worker
 
+    source_id = request.args.get('source', DEFAULT_SOURCE)
+    uri = request.args.get('uri', '0')
     try:
-        if camera is None:
-            camera = cv2.VideoCapture(0)  # Open the webcam
+        if detector_worker is None:
+            # Start the shared inference worker on the first source
+            detector_worker = BatchedDetectionWorker(detect_objects_batch, max_batch=DETECTION_MAX_BATCH,
+                                                     max_latency=DETECTION_MAX_LATENCY_MS / 1000)
+            detector_worker.start()
+
+        if detector_worker.get_source(source_id) is not None:
+            return jsonify({"status": "Stream started successfully", "source": source_id})
+        if len(detector_worker.sources()) >= MAX_SOURCES:
+            return jsonify({"error": f"Too many sources (max {MAX_SOURCES})"}), 429
 
+        camera = open_capture(uri)  # Open the webcam or video source
         if not camera.isOpened():
+            camera.release()
             return jsonify({"error": "Could not open camera"}), 500
 
-        is_streaming = True  # Start streaming
-        return jsonify({"status": "Stream started successfully"})
+        # Start the capture thread; its frames join the shared detection batches
+        tracker = create_tracker()
+        source = StreamSource(source_id, camera, scheduler=create_scheduler(), tracker=tracker,
+                              on_detections=lambda detections: announce_tracks(tracker.update(detections)))
+        # One producer draws and encodes each frame for all of this source's viewers
+        source.hub = BroadcastHub(source.grabber, lambda frame: render_frame(source, frame), create_encoder(),
+                                  max_buffer=STREAM_CLIENT_BUFFER)
+        detector_worker.add_source(source)
+        return jsonify({"status": "Stream started successfully", "source": source_id})
 
     except Exception as e:
         return jsonify({"error": f"Failed to start stream: {str(e)}"}), 500
 
-# Route to stop the camera stream
+# Route to stop a camera stream
 @app.route('/stop')
 def stop_stream():
-    global camera, is_streaming
-
+    source_id = request.args.get('source', DEFAULT_SOURCE)
     try:
-        is_streaming = False  # Stop the streaming loop
-        if camera is not None:
-            camera.release()  # Release the camera resource
-            camera = None
-        return jsonify({"status": "Stream stopped successfully"})
+        if detector_worker is not None:
+            detector_worker.remove_source(source_id)  # Stops the capture thread and releases the camera
+        return jsonify({"status": "Stream stopped successfully", "source": source_id})
 
     except Exception as e:
         return jsonify({"error": f"Failed to stop stream: {str(e)}"}), 500
 
-# Route to serve video feed as a live stream
+# Route to serve a source's video feed as a live stream
 @app.route('/video_feed')
 def video_feed():
-    return Response(generate_frames(),
+    source = detector_worker.get_source(request.args.get('source', DEFAULT_SOURCE)) \
+        if detector_worker is not None else None
+    if source is None:
+        return jsonify({"error": "Stream not started"}), 404
+    # Every viewer subscribes to the same hub, so extra viewers don't add capture, inference or encoding work
+    return Response(source.hub.stream(),
                     mimetype='multipart/x-mixed-replace; boundary=frame')
 
-# Route to get status of the camera and stream
+# Route to get status of the cameras and streams
+# /status?source=<id> describes one source; without it, every source is listed
 @app.route('/status')
 def get_status():
-    return jsonify({
-        "is_streaming": is_streaming,
-        "camera_initialized": camera is not None
-    })
+    sources = {source.source_id: source_status(source)
+               for source in (detector_worker.sources() if detector_worker is not None else [])}
+    status = {
+        "batching": detector_worker.stats() if detector_worker is not None else None,
+        "detector": {
+            "backend": DETECTOR_BACKEND,
+            "torch_threads": torch_threads,
+            "timings": detector.timings.stats()  # preprocess / forward / postprocess in ms
+        },
+        "translations": label_translations.stats(),
+        "audio": announcer.stats()
+    }
+    source_id = request.args.get('source')
+    if source_id is not None:
+        source = sources.get(source_id)
+        status.update(source or {"is_streaming": False, "camera_initialized": False})
+        status["source"] = source_id
+    else:
+        status["is_streaming"] = any(source["is_streaming"] for source in sources.values())
+        # Kept for existing clients: describes the default source, as before multiple sources
+        status["camera_initialized"] = sources.get(DEFAULT_SOURCE, {}).get("camera_initialized", False)
+        status["sources"] = sources
+    return jsonify(status)
+
+# Route to get the label translations for a language (defaults to the display language)
+@app.route('/labels')
+def get_labels():
+    language = request.args.get('lang', TARGET_LANGUAGES[0])
+    if language not in TARGET_LANGUAGES:
+        return jsonify({"error": f"Language not configured; expected one of {', '.join(TARGET_LANGUAGES)}"}), 404
+    return jsonify({"language": language, "labels": label_translations.table(language)})
 
 # Default route to show that server is running
 @app.route('/')
@@ -167,5 +301,5 @@ if __name__ == '__main__':
     except Exception as e:
         print(f"Failed to start server: {e}")
     finally:
-        if camera is not None:
-            camera.release()  # Ensure camera is released when app stops
+        if detector_worker is not None:
+            detector_worker.stop()  # Ensure every camera is released when app stops
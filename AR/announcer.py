@@ -0,0 +1,130 @@
+# Spoken announcements for the AR object detection service
+# A single audio worker plays announcements from a small bounded queue:
+# - a new announcement for a label that is already waiting replaces it instead of queueing twice
+# - when the queue is full the oldest announcement is dropped
+# - announcements older than max_age seconds are skipped, so the speaker never lags the video
+# Synthesised clips are cached on disk per (text, language) and can be generated ahead of time,
+# so each phrase is only ever synthesised once. Synthesis and playback are pluggable.
+import collections  # Bounded queue
+import hashlib  # Clip file names
+import os  # Paths and atomic replace
+import tempfile  # Atomic clip writes
+import threading  # Audio worker
+import time  # Staleness checks
+
+
+# Text-to-speech with Google TTS
+class GTTSSynthesizer:
+    def synthesize(self, text, language, path):
+        from gtts import gTTS  # Google Text-to-Speech for generating audio
+
+        gTTS(text, lang=language).save(path)
+
+
+# Plays clips on the local speakers
+class PlaysoundPlayer:
+    def play(self, path):
+        from playsound import playsound  # To play audio output
+
+        playsound(path)
+
+
+# Plays nothing; keeps the clips it was given (for tests and headless servers)
+class NullPlayer:
+    def __init__(self):
+        self.played = []
+
+    def play(self, path):
+        self.played.append(path)
+
+
+PLAYERS = {"playsound": PlaysoundPlayer, "null": NullPlayer}
+
+
+class Announcer(threading.Thread):
+    def __init__(self, synthesizer, player, cache_dir="audio_cache", max_queue=4, max_age=3.0):
+        super().__init__(daemon=True)
+        self.synthesizer = synthesizer
+        self.player = player
+        self.cache_dir = cache_dir
+        self.max_queue = max(int(max_queue), 1)
+        self.max_age = max_age  # Seconds; 0 never skips stale announcements
+        self.stats_counts = {"queued": 0, "merged": 0, "dropped": 0, "stale": 0, "played": 0,
+                             "synthesized": 0, "errors": 0}
+        self._queue = collections.OrderedDict()  # (label, language) -> (text, queued_at)
+        self._condition = threading.Condition()
+        self._clip_lock = threading.Lock()  # One synthesis per clip at a time
+        self._running = True
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def clip_path(self, text, language):
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{language}_{digest}.mp3")
+
+    # Return the cached clip for text, synthesising it on first use
+    def clip(self, text, language):
+        path = self.clip_path(text, language)
+        if os.path.exists(path):
+            return path
+        with self._clip_lock:
+            if not os.path.exists(path):
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".mp3")
+                os.close(fd)
+                try:
+                    self.synthesizer.synthesize(text, language, tmp_path)
+                    os.replace(tmp_path, path)  # Readers never see a half-written clip
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                self.stats_counts["synthesized"] += 1
+        return path
+
+    # Synthesise clips ahead of time for (text, language) pairs; errors are counted, not raised
+    def pregenerate(self, items):
+        for text, language in items:
+            try:
+                self.clip(text, language)
+            except Exception as e:
+                self.stats_counts["errors"] += 1
+                print(f"Could not pre-generate audio for {text!r}: {e}")
+
+    # Queue an announcement; never blocks the caller
+    def announce(self, label, text, language):
+        key = (label, language)
+        with self._condition:
+            if key in self._queue:
+                self._queue.pop(key)
+                self.stats_counts["merged"] += 1
+            elif len(self._queue) >= self.max_queue:
+                self._queue.popitem(last=False)  # Drop the oldest
+                self.stats_counts["dropped"] += 1
+            self._queue[key] = (text, time.time())
+            self.stats_counts["queued"] += 1
+            self._condition.notify()
+
+    def run(self):
+        while self._running:
+            with self._condition:
+                self._condition.wait_for(lambda: self._queue or not self._running)
+                if not self._running:
+                    break
+                (label, language), (text, queued_at) = self._queue.popitem(last=False)
+
+            if self.max_age and time.time() - queued_at > self.max_age:
+                self.stats_counts["stale"] += 1
+                continue
+            try:
+                self.player.play(self.clip(text, language))
+                self.stats_counts["played"] += 1
+            except Exception as e:
+                self.stats_counts["errors"] += 1
+                print(f"Error in audio playback: {e}")
+
+    def stats(self):
+        with self._condition:
+            return dict(self.stats_counts, pending=len(self._queue))
+
+    def stop(self):
+        self._running = False
+        with self._condition:
+            self._condition.notify_all()
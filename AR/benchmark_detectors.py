@@ -0,0 +1,94 @@
+# Benchmark the detector backends on a fixed set of images
+# Reports latency (mean / p50 / p95 per image) and agreement with the reference
+# fp32 DETR backend: a detection counts as matched when a reference detection has
+# the same label and IoU >= 0.5. This is agreement with the fp32 model on the supplied
+# images, not accuracy against ground truth; it isn't reported if the reference fails to load.
+#
+# Usage:
+#   python benchmark_detectors.py --images path/to/images
+#   python benchmark_detectors.py --images path/to/images --backends detr detr-int8 yolos-tiny --runs 5
+import argparse  # Command line options
+import glob  # Finding the benchmark images
+import os  # Paths
+import statistics  # Latency percentiles
+import time  # Timing
+from PIL import Image  # Loading images
+
+from detectors import BACKENDS, create_detector
+from tracker import iou  # Intersection over union of two boxes
+
+
+# Convert post-processed results to a list of (label name, box)
+def to_detections(results, id2label):
+    return [(id2label[label.item()], box.tolist()) for label, box in zip(results["labels"], results["boxes"])]
+
+
+# Count greedy label+IoU matches between two detection lists
+def count_matches(detections, reference, min_iou=0.5):
+    unmatched = list(reference)
+    matches = 0
+    for label, box in detections:
+        best = max((r for r in unmatched if r[0] == label), key=lambda r: iou(box, r[1]), default=None)
+        if best is not None and iou(box, best[1]) >= min_iou:
+            unmatched.remove(best)
+            matches += 1
+    return matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare detector backends on CPU.")
+    parser.add_argument("--images", required=True, help="Directory of .jpg/.png benchmark images")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS))
+    parser.add_argument("--reference", default="detr", help="Backend the others are compared against")
+    parser.add_argument("--runs", type=int, default=3, help="Timed passes over the image set")
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--onnx-path", default="detr-resnet-50.onnx")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.images, "*.jpg")) + glob.glob(os.path.join(args.images, "*.png")))
+    if not paths:
+        raise SystemExit(f"No images found in {args.images}")
+    images = [Image.open(path).convert("RGB") for path in paths]
+
+    backends = [args.reference] + [name for name in args.backends if name != args.reference]
+    reference = None
+    print(f"precision / recall: agreement with the {args.reference} backend on these {len(images)} images, "
+          f"not accuracy against ground truth")
+    print(f"{'backend':<12} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'precision':>10} {'recall':>8}")
+
+    for name in backends:
+        options = {"onnx_path": args.onnx_path} if name == "detr-onnx" else {}
+        try:
+            detector = create_detector(name, **options)
+        except Exception as e:
+            print(f"{name:<12} skipped: {e}")
+            if name == args.reference:
+                print(f"Reference backend {name} unavailable: precision / recall are not reported")
+            continue
+
+        detections = [to_detections(detector.detect(image, args.threshold), detector.id2label) for image in images]  # Also warms up
+        latencies = []
+        for _ in range(args.runs):
+            for image in images:
+                started = time.perf_counter()
+                detector.detect(image, args.threshold)
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        if name == args.reference:
+            reference = detections
+        if reference is not None:
+            matched = sum(count_matches(d, r) for d, r in zip(detections, reference))
+            predicted = sum(len(d) for d in detections)
+            expected = sum(len(r) for r in reference)
+            precision = f"{matched / predicted if predicted else 1.0:.2f}"
+            recall = f"{matched / expected if expected else 1.0:.2f}"
+        else:
+            precision = recall = "n/a"  # Never score a backend against a substitute reference
+
+        p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+        print(f"{name:<12} {statistics.mean(latencies):>9.1f} {statistics.median(latencies):>9.1f} "
+              f"{p95:>9.1f} {precision:>10} {recall:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+# Broadcast hub for the MJPEG video streams
+# One producer per source draws the tracked boxes and encodes each frame once; every /video_feed
+# client subscribes to the hub and gets the encoded parts through its own small buffer.
+# A client that can't keep up loses its oldest buffered frames, never slowing down the others,
+# so the cost of a source stays flat in the number of viewers.
+import collections  # Per-client bounded buffers
+import threading  # Producer thread and client wake-ups
+import time  # For measuring how fast each client takes frames
+
+
+# One client's buffer of encoded multipart parts
+class Subscriber:
+    def __init__(self, max_buffer=2):
+        self.parts = collections.deque(maxlen=max(int(max_buffer), 1))
+        self.dropped = 0  # Frames discarded because the client was too slow
+        self.closed = False
+        self._condition = threading.Condition()
+
+    def put(self, parts):
+        with self._condition:
+            if len(self.parts) == self.parts.maxlen:
+                self.dropped += 1  # deque drops the oldest on append
+            self.parts.append(parts)
+            self._condition.notify()
+
+    # Next parts for this client, or None on timeout / when the hub closed the subscription
+    def get(self, timeout=1.0):
+        with self._condition:
+            self._condition.wait_for(lambda: self.parts or self.closed, timeout)
+            return self.parts.popleft() if self.parts else None
+
+    def close(self):
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+
+class BroadcastHub(threading.Thread):
+    def __init__(self, grabber, render_fn, encoder, max_buffer=2):
+        super().__init__(daemon=True)
+        self.grabber = grabber
+        self.render_fn = render_fn  # Draws overlays on a frame copy in place
+        self.encoder = encoder  # Shared StreamEncoder; adaptive quality follows the clients' send times
+        self.max_buffer = max_buffer
+        self.frames_encoded = 0
+        self._subscribers = set()
+        self._running = True
+        self._lock = threading.Lock()
+
+    # New client buffer; already closed if the hub has stopped, so its stream ends at once
+    def subscribe(self):
+        subscriber = Subscriber(self.max_buffer)
+        with self._lock:
+            if not self._running:
+                subscriber.close()
+                return subscriber
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+        subscriber.close()
+
+    def run(self):
+        last_id = 0
+        while self._running:
+            frame_id, frame = self.grabber.wait_for_frame(last_id)
+            if frame is None:
+                if self.grabber.failed:
+                    break  # Stop if frame cannot be read
+                continue
+            last_id = frame_id
+
+            with self._lock:
+                subscribers = list(self._subscribers)
+            if not subscribers:
+                continue  # Nobody watching: don't spend CPU on drawing and encoding
+
+            try:
+                frame = frame.copy()  # The capture thread owns the original
+                self.render_fn(frame)
+                parts = self.encoder.multipart(self.encoder.encode(frame))
+                self.frames_encoded += 1
+                for subscriber in subscribers:
+                    subscriber.put(parts)
+            except Exception as e:
+                print(f"Error processing frame: {e}")
+        self.stop()
+
+    # Generator of multipart chunks for one client, for use as a streaming response body
+    def stream(self):
+        subscriber = self.subscribe()
+        try:
+            while not subscriber.closed:
+                parts = subscriber.get()
+                if parts is None:
+                    continue
+                # The server writes each chunk before resuming the generator,
+                # so the elapsed time is this client's send time
+                started = time.time()
+                for chunk in parts:
+                    yield chunk
+                self.encoder.report_send_time(time.time() - started)
+        finally:
+            self.unsubscribe(subscriber)  # Runs when the client disconnects, too
+
+    def stats(self):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        return {
+            "viewers": len(subscribers),
+            "frames_encoded": self.frames_encoded,
+            "frames_dropped": sum(subscriber.dropped for subscriber in subscribers),
+            "encoder": self.encoder.stats()
+        }
+
+    def stop(self):
+        with self._lock:
+            self._running = False  # Under the lock, so no client can subscribe after the close below
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.close()
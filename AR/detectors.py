@@ -0,0 +1,186 @@
+# Detector backends for the AR object detection service
+# Every backend exposes the same small interface so the model can be swapped through
+# configuration (DETECTOR_BACKEND) without touching the streaming code:
+#   backend.id2label                  -> {class id: label name}
+#   backend.detect(image, threshold)  -> {"scores", "labels", "boxes"} in pixel coordinates,
+#                                        i.e. the output of processor.post_process_object_detection
+#   backend.detect_batch(images, ...) -> one such result per image, from a single forward pass
+#   backend.timings                   -> StageTimer with preprocess / forward / postprocess times
+#   backend.optimize(...)             -> optional channels-last memory format / torch.compile
+# Backends:
+# - "detr":           facebook/detr-resnet-50 in eager PyTorch fp32 (original behaviour)
+# - "detr-int8":      the same model with its Linear layers dynamically quantized to int8
+# - "detr-onnx":      an ONNX export of DETR run with ONNX Runtime (see export_detr_onnx)
+# - "yolos-tiny":     hustvl/yolos-tiny, a much smaller CPU-friendly transformer detector
+import os  # For checking the ONNX model path
+import torch  # PyTorch for handling tensors
+from transformers import (
+    AutoImageProcessor,
+    AutoModelForObjectDetection,
+    DetrConfig,
+    DetrForObjectDetection,
+    DetrImageProcessor,
+)
+from transformers.models.detr.modeling_detr import DetrObjectDetectionOutput
+
+from runtime import StageTimer
+
+DETR_MODEL = "facebook/detr-resnet-50"
+DETR_REVISION = "no_timm"
+
+
+# Eager PyTorch DETR (fp32)
+class DetrBackend:
+    name = "detr"
+
+    channels_last = False  # Feed inputs in NHWC layout (set by optimize)
+
+    def __init__(self, model_name=DETR_MODEL, revision=DETR_REVISION):
+        self.processor = DetrImageProcessor.from_pretrained(model_name, revision=revision)
+        self.model = DetrForObjectDetection.from_pretrained(model_name, revision=revision)
+        self.model.eval()
+        self.id2label = self.model.config.id2label
+        self.timings = StageTimer()
+
+    # Optional PyTorch optimisations; each is skipped with a message if unsupported
+    def optimize(self, channels_last=False, compile=False):
+        if channels_last:
+            try:
+                self.model = self.model.to(memory_format=torch.channels_last)
+                self.channels_last = True
+            except Exception as e:
+                print(f"channels_last not applied: {e}")
+        if compile and hasattr(torch, "compile"):
+            try:
+                self.model = torch.compile(self.model)
+            except Exception as e:
+                print(f"torch.compile not applied: {e}")
+
+    # Run the model on preprocessed inputs; returns a DETR-style output for post-processing
+    def forward(self, inputs):
+        if self.channels_last:
+            inputs["pixel_values"] = inputs["pixel_values"].contiguous(memory_format=torch.channels_last)
+        return self.model(**inputs)
+
+    # Detect objects in a PIL image
+    def detect(self, image, threshold=0.9):
+        return self.detect_batch([image], threshold)[0]
+
+    # Detect objects in several PIL images with a single forward pass
+    # The processor pads the images to a common size and the pixel mask hides the padding,
+    # so frames from cameras with different resolutions can share a batch.
+    def detect_batch(self, images, threshold=0.9):
+        # inference_mode: no autograd graph is recorded for any of the stages
+        with torch.inference_mode():
+            with self.timings.stage("preprocess"):
+                inputs = self.processor(images=images, return_tensors="pt")
+            with self.timings.stage("forward"):
+                outputs = self.forward(inputs)
+            with self.timings.stage("postprocess"):
+                target_sizes = torch.tensor([image.size[::-1] for image in images])
+                return self.processor.post_process_object_detection(
+                    outputs, target_sizes=target_sizes, threshold=threshold)
+
+
+# DETR with dynamic int8 quantization of the Linear layers (transformer + heads)
+class QuantizedDetrBackend(DetrBackend):
+    name = "detr-int8"
+
+    def __init__(self, model_name=DETR_MODEL, revision=DETR_REVISION):
+        super().__init__(model_name, revision)
+        self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+# DETR exported to ONNX and run with ONNX Runtime
+class OnnxDetrBackend(DetrBackend):
+    name = "detr-onnx"
+
+    def __init__(self, onnx_path="detr-resnet-50.onnx", model_name=DETR_MODEL, revision=DETR_REVISION):
+        import onnxruntime  # Optional dependency, only needed for this backend
+
+        if not os.path.exists(onnx_path):
+            raise FileNotFoundError(f"ONNX model not found at {onnx_path}; create it with "
+                                    f"`python detectors.py export {onnx_path}`")
+        # Only the processor and label map are needed from Hugging Face, not the weights
+        self.processor = DetrImageProcessor.from_pretrained(model_name, revision=revision)
+        self.id2label = DetrConfig.from_pretrained(model_name, revision=revision).id2label
+        self.session = onnxruntime.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+        self.timings = StageTimer()
+
+    def optimize(self, channels_last=False, compile=False):
+        pass  # ONNX Runtime applies its own graph optimisations
+
+    def forward(self, inputs):
+        logits, pred_boxes = self.session.run(
+            ["logits", "pred_boxes"],
+            {
+                "pixel_values": inputs["pixel_values"].numpy(),
+                "pixel_mask": inputs["pixel_mask"].numpy().astype("int64"),
+            }
+        )
+        # Wrap the arrays so processor.post_process_object_detection works unchanged
+        return DetrObjectDetectionOutput(logits=torch.from_numpy(logits), pred_boxes=torch.from_numpy(pred_boxes))
+
+
+# Smaller CPU-friendly detector with the same post-processing contract
+class YolosTinyBackend(DetrBackend):
+    name = "yolos-tiny"
+
+    def __init__(self, model_name="hustvl/yolos-tiny"):
+        self.processor = AutoImageProcessor.from_pretrained(model_name)
+        self.model = AutoModelForObjectDetection.from_pretrained(model_name)
+        self.model.eval()
+        self.id2label = self.model.config.id2label
+        self.timings = StageTimer()
+
+    def forward(self, inputs):
+        return self.model(pixel_values=inputs["pixel_values"])  # YOLOS takes no pixel mask
+
+
+BACKENDS = {
+    DetrBackend.name: DetrBackend,
+    QuantizedDetrBackend.name: QuantizedDetrBackend,
+    OnnxDetrBackend.name: OnnxDetrBackend,
+    YolosTinyBackend.name: YolosTinyBackend,
+}
+
+
+# Create a detector backend by name
+def create_detector(name, **options):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown detector backend {name!r}; expected one of {', '.join(BACKENDS)}")
+    return BACKENDS[name](**options)
+
+
+# Export facebook/detr-resnet-50 to ONNX for the "detr-onnx" backend
+def export_detr_onnx(onnx_path, model_name=DETR_MODEL, revision=DETR_REVISION):
+    model = DetrForObjectDetection.from_pretrained(model_name, revision=revision)
+    model.eval()
+    model.config.return_dict = False  # Plain tuple outputs for the exporter
+    pixel_values = torch.randn(1, 3, 800, 1066)
+    pixel_mask = torch.ones(1, 800, 1066, dtype=torch.int64)
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (pixel_values, pixel_mask),
+            onnx_path,
+            input_names=["pixel_values", "pixel_mask"],
+            output_names=["logits", "pred_boxes"],
+            dynamic_axes={
+                "pixel_values": {0: "batch", 2: "height", 3: "width"},
+                "pixel_mask": {0: "batch", 1: "height", 2: "width"},
+                "logits": {0: "batch"},
+                "pred_boxes": {0: "batch"},
+            },
+            opset_version=17,
+        )
+    print(f"Exported {model_name} to {onnx_path}")
+
+
+if __name__ == '__main__':
+    import sys
+
+    if len(sys.argv) >= 2 and sys.argv[1] == "export":
+        export_detr_onnx(sys.argv[2] if len(sys.argv) > 2 else "detr-resnet-50.onnx")
+    else:
+        print("Usage: python detectors.py export [output.onnx]")
@@ -0,0 +1,86 @@
+# JPEG encoder for the MJPEG video streams
+# - scale:    resize frames before encoding (e.g. 0.5 halves width and height)
+# - quality:  JPEG quality (1-100); OpenCV's default is 95
+# - backend:  "turbojpeg" (PyTurboJPEG, faster) when installed, otherwise OpenCV; "auto" picks
+# - adaptive: lower the quality while a client can't keep up with target_fps and raise it
+#             again when it can, based on how long each frame took to send
+# multipart() returns a frame as separate chunks (header, JPEG, trailer) so the JPEG bytes are
+# handed to the server as they are instead of being copied into a concatenated part.
+import time  # For measuring send times
+import cv2  # OpenCV for resizing and the fallback encoder
+
+BOUNDARY = b'frame'
+
+
+# Load PyTurboJPEG if it is installed (and libjpeg-turbo can be found)
+def _load_turbojpeg():
+    try:
+        from turbojpeg import TurboJPEG
+        return TurboJPEG()
+    except Exception:
+        return None
+
+
+class StreamEncoder:
+    def __init__(self, scale=1.0, quality=80, backend="auto", adaptive=False,
+                 min_quality=40, max_quality=90, target_fps=15.0):
+        self.scale = scale
+        self.quality = int(quality)
+        self.adaptive = adaptive
+        # The bounds always include the configured quality, so adapting never moves past it the wrong way
+        self.min_quality = min(min_quality, self.quality)
+        self.max_quality = max(max_quality, self.quality)
+        self.target_fps = target_fps
+        self._turbojpeg = _load_turbojpeg() if backend in ("auto", "turbojpeg") else None
+        if backend == "turbojpeg" and self._turbojpeg is None:
+            print("turbojpeg not available, falling back to OpenCV")
+        self.backend = "turbojpeg" if self._turbojpeg is not None else "opencv"
+        self.frames = 0
+        self.bytes_sent = 0
+        self._send_time = 0.0  # Moving average of seconds spent handing a frame to the client
+        self._last_adjust = 0.0
+
+    # Encode a BGR frame to JPEG bytes
+    def encode(self, frame):
+        if self.scale != 1.0:
+            frame = cv2.resize(frame, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        if self._turbojpeg is not None:
+            jpeg = self._turbojpeg.encode(frame, quality=self.quality)  # Expects BGR by default
+        else:
+            ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+            jpeg = buffer.tobytes()
+        self.frames += 1
+        self.bytes_sent += len(jpeg)
+        return jpeg
+
+    # A multipart/x-mixed-replace part as chunks, without copying the JPEG into a new buffer
+    @staticmethod
+    def multipart(jpeg):
+        header = b'--' + BOUNDARY + b'\r\nContent-Type: image/jpeg\r\nContent-Length: ' + \
+            str(len(jpeg)).encode() + b'\r\n\r\n'
+        return header, jpeg, b'\r\n'
+
+    # Record how long the client took to take a frame; adapts the quality at most once a second
+    def report_send_time(self, seconds, now=None):
+        if not self.adaptive:
+            return
+        now = time.time() if now is None else now
+        self._send_time += 0.2 * (seconds - self._send_time)
+        if now - self._last_adjust < 1.0:
+            return
+        self._last_adjust = now
+        budget = 1.0 / self.target_fps
+        if self._send_time > 0.8 * budget:
+            self.quality = max(self.min_quality, self.quality - 10)  # Client is falling behind
+        elif self._send_time < 0.3 * budget:
+            self.quality = min(self.max_quality, self.quality + 5)  # Plenty of headroom
+
+    def stats(self):
+        return {
+            "backend": self.backend,
+            "quality": self.quality,
+            "scale": self.scale,
+            "frames": self.frames,
+            "mean_frame_bytes": self.bytes_sent // self.frames if self.frames else 0,
+            "send_time_ms": round(self._send_time * 1000, 2)
+        }
@@ -0,0 +1,101 @@
+# Label translation cache for the AR object detection service
+# The detector can only ever output the labels in id2label (the ~90 COCO classes), so every
+# translation is worked out once at startup and the frame loop only does a dict lookup.
+# For each target language a label is resolved from, in order:
+# 1. the offline dictionary shipped with the service (label_dictionary.json)
+# 2. the on-disk cache of earlier online translations
+# 3. GoogleTranslator, at startup only and only if online translation is enabled
+# 4. the English label itself
+import json  # Dictionary and cache files
+import os  # Paths and atomic replace
+import tempfile  # Atomic cache writes
+import threading  # Lock around the table while it is being filled
+
+
+class LabelTranslations:
+    def __init__(self, languages, dictionary_path="label_dictionary.json",
+                 cache_path="label_translations.json", online=True):
+        self.languages = list(languages)
+        self.dictionary_path = dictionary_path
+        self.cache_path = cache_path
+        self.online = online
+        self._table = {language: {} for language in self.languages}  # language -> {label: translation}
+        self._lock = threading.Lock()
+        self.sources = {"dictionary": 0, "cache": 0, "online": 0, "fallback": 0}
+
+    @staticmethod
+    def _load(path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"Could not read {path}: {e}")
+            return {}
+
+    def _save_cache(self, cache):
+        folder = os.path.dirname(os.path.abspath(self.cache_path))
+        fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(cache, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Could not write {self.cache_path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    # Translate every label for every configured language; returns the number of online lookups
+    def precompute(self, labels):
+        labels = sorted({label for label in labels if label and label != "N/A"})
+        dictionary = self._load(self.dictionary_path)
+        cache = self._load(self.cache_path)
+        translated_online = 0
+
+        for language in self.languages:
+            known = dictionary.get(language, {})
+            cached = cache.setdefault(language, {})
+            translator = None
+            table = {}
+            for label in labels:
+                if label in known:
+                    table[label] = known[label]
+                    self.sources["dictionary"] += 1
+                elif label in cached:
+                    table[label] = cached[label]
+                    self.sources["cache"] += 1
+                elif self.online:
+                    try:
+                        if translator is None:
+                            from deep_translator import GoogleTranslator  # Only needed for cache misses
+                            translator = GoogleTranslator(source="en", target=language)
+                        table[label] = cached[label] = translator.translate(label)
+                        translated_online += 1
+                        self.sources["online"] += 1
+                    except Exception as e:
+                        print(f"Translation error for {label!r} ({language}): {e}")
+                        table[label] = label
+                        self.sources["fallback"] += 1
+                else:
+                    table[label] = label
+                    self.sources["fallback"] += 1
+            with self._lock:
+                self._table[language] = table
+
+        if translated_online:
+            self._save_cache(cache)
+        return translated_online
+
+    # Translation of a label; never does I/O, unknown labels come back unchanged
+    def get(self, label, language=None):
+        language = language or self.languages[0]
+        return self._table.get(language, {}).get(label, label)
+
+    def table(self, language=None):
+        with self._lock:
+            return dict(self._table.get(language or self.languages[0], {}))
+
+    def stats(self):
+        return {"languages": self.languages, "labels": {language: len(table) for language, table in self._table.items()},
+                "sources": dict(self.sources)}
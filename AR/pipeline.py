@@ -0,0 +1,209 @@
+# Capture / inference pipeline for the AR object detection service
+# The camera, the detector and the MJPEG stream each run at their own pace:
+# - FrameGrabber keeps reading the camera and always holds the most recent frame.
+# - BatchedDetectionWorker runs the detector on the newest frame whenever it is free,
+#   so inference runs at whatever rate the model can sustain.
+# - Each source's BroadcastHub (see broadcast.py) draws the most recent detections on every
+#   camera frame and encodes it once for all of its viewers, so video stays smooth.
+# With several cameras, each StreamSource has its own FrameGrabber and scheduler and the
+# single BatchedDetectionWorker collects their frames into one batch per forward pass.
+import threading  # Threads and the condition used to hand frames over
+import time  # For timing inference
+
+
+# Thread that continuously reads frames from a camera and keeps only the latest one
+class FrameGrabber(threading.Thread):
+    def __init__(self, camera, on_frame=None):
+        super().__init__(daemon=True)
+        self.camera = camera
+        self.on_frame = on_frame  # Optional callback after every new frame (wakes the batch worker)
+        self.frame = None  # Most recent frame
+        self.frame_id = 0  # Increases by one for every frame read
+        self.failed = False  # Set when the camera stops delivering frames
+        self._running = True
+        self._exited = False  # run() has returned, so camera.read() is no longer in progress
+        self._release_pending = False  # Release the camera as soon as run() returns
+        self._condition = threading.Condition()
+
+    def run(self):
+        while self._running:
+            success, frame = self.camera.read()
+            with self._condition:
+                if not success:
+                    self.failed = True
+                    self._condition.notify_all()
+                    break
+                self.frame = frame
+                self.frame_id += 1
+                self._condition.notify_all()  # Wake up the stream and the detector
+            if self.on_frame is not None:
+                self.on_frame()
+        with self._condition:
+            self._exited = True
+            release = self._release_pending
+        if release:
+            self.camera.release()
+
+    # Return the latest (frame_id, frame) once it is newer than last_id, or (last_id, None) on timeout
+    def wait_for_frame(self, last_id, timeout=1.0):
+        with self._condition:
+            self._condition.wait_for(lambda: self.frame_id != last_id or self.failed or not self._running, timeout)
+            if self.frame_id == last_id or self.frame is None:
+                return last_id, None
+            return self.frame_id, self.frame
+
+    def stop(self):
+        self._running = False
+        with self._condition:
+            self._condition.notify_all()
+
+    # Release the camera now if run() isn't reading from it, otherwise as soon as run() returns
+    def release_camera(self):
+        with self._condition:
+            release = self._exited or self.ident is None  # Finished or never started
+            self._release_pending = not release
+        if release:
+            self.camera.release()
+
+
+# One camera or video source served by the batched detector
+class StreamSource:
+    def __init__(self, source_id, camera, scheduler=None, tracker=None, on_detections=None):
+        self.source_id = source_id
+        self.camera = camera
+        self.grabber = FrameGrabber(camera)
+        self.scheduler = scheduler  # Optional DetectionScheduler for this source
+        self.tracker = tracker  # Optional IoUTracker fed from on_detections
+        self.hub = None  # Optional BroadcastHub streaming this source to its viewers
+        self.on_detections = on_detections  # Optional callback, e.g. to announce objects
+        self.inference_time = 0.0  # Seconds taken by the most recent batch with this source
+        self.last_id = 0  # Last frame id looked at by the batch worker
+        self.running = False
+
+    def start(self):
+        self.running = True
+        self.grabber.start()
+        if self.hub is not None:
+            self.hub.start()
+
+    def stop(self):
+        self.running = False
+        if self.hub is not None:
+            self.hub.stop()  # Ends every viewer's stream
+        self.grabber.stop()
+        self.grabber.join(timeout=2)  # Let the last camera.read() finish before releasing
+        self.grabber.release_camera()  # Deferred to the grab thread if read() is still blocked
+
+
+# Thread that runs the detector on frames from several sources in dynamically sized batches
+# A batch is sent to the model as soon as it holds max_batch frames, holds a frame from every
+# source, or max_latency seconds have passed since its first frame was collected.
+class BatchedDetectionWorker(threading.Thread):
+    def __init__(self, detect_batch_fn, max_batch=4, max_latency=0.05):
+        super().__init__(daemon=True)
+        self.detect_batch_fn = detect_batch_fn  # list of frames -> list of detection lists
+        self.max_batch = max(int(max_batch), 1)
+        self.max_latency = max_latency
+        self.batches = 0
+        self.frames_detected = 0
+        self._sources = {}
+        self._running = True
+        self._lock = threading.Lock()
+        self._wake = threading.Event()  # Set by the grabbers whenever a new frame arrives
+
+    def add_source(self, source):
+        source.grabber.on_frame = self._wake.set
+        with self._lock:
+            self._sources[source.source_id] = source
+        source.start()
+
+    # Remove a source from the batch and release its camera
+    def remove_source(self, source_id):
+        with self._lock:
+            source = self._sources.pop(source_id, None)
+        if source is not None:
+            source.stop()
+        return source
+
+    # Drop sources whose camera stopped delivering frames (e.g. an uploaded video ended),
+    # so /start opens them again and /video_feed stops handing out their finished streams
+    def _discard_failed(self):
+        with self._lock:
+            failed = [source for source in self._sources.values() if source.grabber.failed]
+            for source in failed:
+                del self._sources[source.source_id]
+        for source in failed:
+            source.stop()
+
+    def get_source(self, source_id):
+        self._discard_failed()
+        with self._lock:
+            return self._sources.get(source_id)
+
+    def sources(self):
+        self._discard_failed()
+        with self._lock:
+            return list(self._sources.values())
+
+    # Gather up to max_batch (source, frame) pairs, waiting at most max_latency after the first
+    def _collect(self):
+        batch = []
+        deadline = None
+        while self._running:
+            self._wake.clear()  # Cleared before scanning so a frame arriving mid-scan isn't missed
+            sources = [source for source in self.sources() if not source.grabber.failed]
+            for source in sources:
+                if len(batch) >= self.max_batch:
+                    break
+                if any(source is queued for queued, _ in batch):
+                    continue
+                frame_id, frame = source.grabber.wait_for_frame(source.last_id, timeout=0)
+                if frame is None:
+                    continue
+                source.last_id = frame_id  # Frames that arrived during inference are simply skipped
+                # Reuse the previous detections when the scheduler says this frame isn't worth it
+                if source.scheduler is not None and not source.scheduler.should_run(frame, frame_id):
+                    continue
+                batch.append((source, frame))
+                if deadline is None:
+                    deadline = time.time() + self.max_latency
+
+            now = time.time()
+            if batch and (len(batch) >= min(self.max_batch, len(sources)) or now >= deadline):
+                return batch
+            self._wake.wait(deadline - now if deadline is not None else 1.0)
+        return batch
+
+    def run(self):
+        while self._running:
+            batch = self._collect()
+            if not batch:
+                continue
+            try:
+                started = time.time()
+                results = self.detect_batch_fn([frame for _, frame in batch])
+                elapsed = time.time() - started
+                self.batches += 1
+                self.frames_detected += len(batch)
+                for (source, _), detections in zip(batch, results):
+                    source.inference_time = elapsed
+                    if source.on_detections is not None:
+                        source.on_detections(detections)
+            except Exception as e:
+                print(f"Error running batched detection: {e}")
+
+    def stats(self):
+        return {
+            "sources": len(self.sources()),
+            "batches": self.batches,
+            "frames_detected": self.frames_detected,
+            "mean_batch_size": round(self.frames_detected / self.batches, 2) if self.batches else 0.0,
+            "max_batch": self.max_batch,
+            "max_latency_ms": round(self.max_latency * 1000, 1)
+        }
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+        for source in self.sources():
+            self.remove_source(source.source_id)
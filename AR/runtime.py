@@ -0,0 +1,66 @@
+# Inference runtime configuration for the AR object detection service
+# - configure_torch: intra-op / inter-op thread counts
+# - StageTimer: per-stage timings (preprocess, forward, postprocess) as moving averages
+# - warm_up: runs the detector on a dummy frame so the first real request doesn't pay
+#   for lazy initialisation (allocator growth, kernel selection, compilation)
+import threading  # Lock around the timing statistics
+import time  # For timing stages
+from contextlib import contextmanager  # For the timing context manager
+from PIL import Image  # Dummy warm-up frame
+import torch  # PyTorch runtime settings
+
+
+# Set PyTorch thread pools; 0 keeps PyTorch's default
+def configure_torch(num_threads=0, interop_threads=0):
+    if num_threads > 0:
+        torch.set_num_threads(num_threads)
+    if interop_threads > 0:
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError as e:  # Can only be set before any inter-op parallel work starts
+            print(f"Could not set inter-op threads: {e}")
+    return {"num_threads": torch.get_num_threads(), "interop_threads": torch.get_num_interop_threads()}
+
+
+# Keeps an exponential moving average (and the last value) of each stage's duration in ms
+class StageTimer:
+    def __init__(self, smoothing=0.1):
+        self.smoothing = smoothing
+        self._stages = {}  # stage -> {"last_ms", "avg_ms", "count"}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - started) * 1000)
+
+    def record(self, name, elapsed_ms):
+        with self._lock:
+            stats = self._stages.setdefault(name, {"last_ms": 0.0, "avg_ms": elapsed_ms, "count": 0})
+            stats["last_ms"] = elapsed_ms
+            stats["avg_ms"] += self.smoothing * (elapsed_ms - stats["avg_ms"])
+            stats["count"] += 1
+
+    # Forget all samples, e.g. the slow warm-up runs
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+    def stats(self):
+        with self._lock:
+            return {name: {"last_ms": round(s["last_ms"], 2), "avg_ms": round(s["avg_ms"], 2), "count": s["count"]}
+                    for name, s in self._stages.items()}
+
+
+# Run the detector on a blank frame a few times; returns the warm-up duration in seconds
+# The timings are reset afterwards so the slow first runs don't skew the moving averages
+def warm_up(detector, runs=1, size=(640, 480)):
+    dummy = Image.new("RGB", size)
+    started = time.time()
+    for _ in range(runs):
+        detector.detect(dummy)
+    detector.timings.reset()
+    return time.time() - started
@@ -0,0 +1,72 @@
+# Detection scheduler for the AR object detection service
+# Decides, for every new camera frame, whether the detector should run or whether the
+# detections from the last inference can be reused. Policies:
+# - "always":  run on every frame the worker sees (previous behaviour)
+# - "every_n": run on every Nth camera frame
+# - "rate":    run at most target_fps times per second
+# - "motion":  run only when a cheap frame-difference score says the scene changed
+# Every policy also forces a run after max_interval seconds so detections never go stale.
+import cv2  # OpenCV for the frame-difference motion score
+import time  # For rate limiting
+
+POLICIES = ("always", "every_n", "rate", "motion")
+
+
+class DetectionScheduler:
+    def __init__(self, policy="motion", every_n=5, target_fps=2.0, motion_threshold=8.0, max_interval=2.0):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown detection policy {policy!r}; expected one of {', '.join(POLICIES)}")
+        self.policy = policy
+        self.every_n = max(int(every_n), 1)
+        self.target_fps = target_fps
+        self.motion_threshold = motion_threshold  # Mean absolute pixel difference (0-255)
+        self.max_interval = max_interval  # Seconds; 0 disables the forced refresh
+
+        self.last_run_time = 0.0
+        self.last_run_frame_id = None
+        self.last_motion_score = 0.0
+        self._reference = None  # Downscaled grey frame from the last inference
+        self.frames_seen = 0
+        self.inferences = 0
+
+    # Cheap motion signature: tiny, blurred greyscale copy of the frame
+    @staticmethod
+    def _signature(frame):
+        small = cv2.resize(frame, (64, 48), interpolation=cv2.INTER_AREA)
+        grey = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(grey, (5, 5), 0)
+
+    # Return True if the detector should run on this frame
+    def should_run(self, frame, frame_id, now=None):
+        now = time.time() if now is None else now
+        self.frames_seen += 1
+
+        if self.last_run_frame_id is None:
+            run = True  # Always detect on the first frame
+        elif self.max_interval and now - self.last_run_time >= self.max_interval:
+            run = True
+        elif self.policy == "always":
+            run = True
+        elif self.policy == "every_n":
+            run = frame_id - self.last_run_frame_id >= self.every_n
+        elif self.policy == "rate":
+            run = now - self.last_run_time >= 1.0 / self.target_fps
+        else:
+            self.last_motion_score = float(cv2.absdiff(self._signature(frame), self._reference).mean())
+            run = self.last_motion_score >= self.motion_threshold
+
+        if run:
+            self.last_run_time = now
+            self.last_run_frame_id = frame_id
+            if self.policy == "motion":
+                self._reference = self._signature(frame)
+            self.inferences += 1
+        return run
+
+    def stats(self):
+        return {
+            "policy": self.policy,
+            "frames_seen": self.frames_seen,
+            "inferences": self.inferences,
+            "last_motion_score": round(self.last_motion_score, 2)
+        }
@@ -0,0 +1,49 @@
+# Tests for the IoU tracker: tracks survive missed inferences and objects aren't re-announced
+# Run with:  python -m pytest AR/tests
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tracker import IoUTracker, iou
+
+CUP = ('cup', 'cup', 0.95, (100, 100, 200, 200))
+DOG = ('dog', 'dog', 0.95, (300, 100, 400, 200))
+
+
+class IoUTrackerTest(unittest.TestCase):
+    def test_iou(self):
+        self.assertEqual(iou((0, 0, 10, 10), (0, 0, 10, 10)), 1.0)
+        self.assertEqual(iou((0, 0, 10, 10), (20, 20, 30, 30)), 0.0)
+        self.assertAlmostEqual(iou((0, 0, 10, 10), (5, 0, 15, 10)), 1 / 3)
+
+    def test_missed_inference_keeps_track_without_new_announcement(self):
+        tracker = IoUTracker(max_misses=2)
+        self.assertEqual(len(tracker.update([CUP], now=0.0)), 1)
+        track_id = tracker.tracks[0].track_id
+        # Static scene: inferences 2 s apart, one of which misses the object
+        self.assertEqual(tracker.update([], now=2.0), [])
+        self.assertEqual(len(tracker.predict(now=3.0)), 1)  # Still drawn between inferences
+        self.assertEqual(tracker.update([CUP], now=4.0), [])
+        self.assertEqual([track.track_id for track in tracker.tracks], [track_id])
+
+    def test_track_ends_after_max_misses(self):
+        tracker = IoUTracker(max_misses=2, announce_cooldown=0)
+        tracker.update([CUP], now=0.0)
+        for now in (2.0, 4.0, 6.0):
+            tracker.update([], now=now)
+        self.assertEqual(tracker.predict(now=7.0), [])
+        self.assertEqual(len(tracker.update([CUP], now=8.0)), 1)  # A new appearance is announced
+
+    def test_cooldown_suppresses_quick_reannouncement(self):
+        tracker = IoUTracker(max_misses=0, announce_cooldown=5.0)
+        self.assertEqual(len(tracker.update([CUP, DOG], now=0.0)), 2)
+        tracker.update([], now=1.0)  # Both tracks lost
+        self.assertEqual(tracker.update([CUP], now=2.0), [])  # Within the cooldown
+        tracker.update([], now=3.0)
+        self.assertEqual(len(tracker.update([CUP], now=6.0)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+# Lightweight multi-object tracker for the AR object detection service (IoU matching, SORT-style)
+# - Each inference's detections are matched to existing tracks of the same label by IoU, so an
+#   object keeps a stable track id for as long as it stays in view.
+# - Matched boxes are smoothed and a constant-velocity estimate is kept per track, so boxes can
+#   be extrapolated on the frames where the scheduler skipped inference.
+# - update() returns the tracks that are new, so each object is announced once per appearance.
+#   A label started again within announce_cooldown seconds isn't returned, as a backstop for
+#   objects whose track was lost anyway.
+# - A track ends after max_misses consecutive inferences without a matching detection, however
+#   long the scheduler waits between inferences; until then it stays on screen.
+# Detections use the service's tuple format: (label_name, translated_label, score, (x1, y1, x2, y2))
+import itertools  # Track ids
+import threading  # update() and predict() run on different threads
+import time  # Extrapolation and the announcement cooldown
+
+
+# Intersection over union of two (x_min, y_min, x_max, y_max) boxes
+def iou(a, b):
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+class Track:
+    def __init__(self, track_id, detection, now):
+        self.track_id = track_id
+        self.label_name, self.translated_label, self.score, box = detection
+        self.box = tuple(float(v) for v in box)
+        self.velocity = (0.0, 0.0, 0.0, 0.0)  # Pixels per second for each box coordinate
+        self.last_seen = now
+        self.hits = 1
+        self.misses = 0  # Consecutive inferences without a matching detection
+
+    def update(self, detection, now, predicted, smoothing):
+        _, self.translated_label, self.score, box = detection
+        dt = now - self.last_seen
+        box = tuple(smoothing * b + (1 - smoothing) * p for b, p in zip(box, predicted))
+        if dt > 0:
+            self.velocity = tuple((b - old) / dt for b, old in zip(box, self.box))
+        self.box = box
+        self.last_seen = now
+        self.hits += 1
+        self.misses = 0
+
+    # Box extrapolated to time now with the constant-velocity estimate
+    def predicted_box(self, now):
+        dt = now - self.last_seen
+        return tuple(b + v * dt for b, v in zip(self.box, self.velocity))
+
+    def as_detection(self, box):
+        return (self.label_name, self.translated_label, self.score, tuple(int(round(v)) for v in box))
+
+
+class IoUTracker:
+    def __init__(self, min_iou=0.3, max_misses=2, smoothing=0.6, max_extrapolation=0.5, announce_cooldown=5.0):
+        self.min_iou = min_iou  # Minimum overlap to continue a track
+        self.max_misses = max_misses  # Inferences in a row that may miss an object before its track ends
+        self.smoothing = smoothing  # Weight of the new detection vs. the predicted box (1 = no smoothing)
+        self.max_extrapolation = max_extrapolation  # Seconds of motion to extrapolate at most
+        self.announce_cooldown = announce_cooldown  # Seconds before a label's new track is returned again
+        self.tracks = []
+        self.tracks_started = 0
+        self._last_started = {}  # label -> time its last new track was returned
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    # Match a new set of detections; returns the tracks started by this update that should be announced
+    def update(self, detections, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            predicted = [self._predicted_box(track, now) for track in self.tracks]
+            # Greedy matching: highest-IoU pairs first, same label only
+            pairs = sorted(
+                ((iou(predicted[t], detection[3]), t, d)
+                 for t, track in enumerate(self.tracks)
+                 for d, detection in enumerate(detections)
+                 if track.label_name == detection[0]),
+                reverse=True
+            )
+            matched_tracks, matched_detections = set(), set()
+            for overlap, t, d in pairs:
+                if overlap < self.min_iou:
+                    break
+                if t in matched_tracks or d in matched_detections:
+                    continue
+                self.tracks[t].update(detections[d], now, predicted[t], self.smoothing)
+                matched_tracks.add(t)
+                matched_detections.add(d)
+
+            for t, track in enumerate(self.tracks):
+                if t not in matched_tracks:
+                    track.misses += 1
+
+            new_tracks = [Track(next(self._ids), detection, now)
+                          for d, detection in enumerate(detections) if d not in matched_detections]
+            self.tracks_started += len(new_tracks)
+            self.tracks = [track for track in self.tracks if track.misses <= self.max_misses] + new_tracks
+
+            announced = []
+            for track in new_tracks:
+                last = self._last_started.get(track.label_name)
+                if last is None or now - last >= self.announce_cooldown:
+                    self._last_started[track.label_name] = now
+                    announced.append(track)
+            return announced
+
+    # Current tracks as detections, with boxes extrapolated to time now
+    def predict(self, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            return [track.as_detection(self._predicted_box(track, now)) for track in self.tracks]
+
+    # Extrapolate a track, but never by more than max_extrapolation seconds of motion
+    def _predicted_box(self, track, now):
+        return track.predicted_box(min(now, track.last_seen + self.max_extrapolation))
+
+    def stats(self):
+        with self._lock:
+            return {"active_tracks": len(self.tracks), "tracks_started": self.tracks_started}
@@ -1,24 +1,99 @@
 from flask import Flask, Response
 from flask_cors import CORS
 import cv2
+import os
+import threading
 
 app = Flask(__name__)
 CORS(app)
 
-def generate_frames():
+# Stream encoding settings
+STREAM_SCALE = float(os.environ.get('STREAM_SCALE', 1.0))  # Output size relative to the camera frame
+STREAM_JPEG_QUALITY = int(os.environ.get('STREAM_JPEG_QUALITY', 80))
+
+def encode_frame(frame):
+    if STREAM_SCALE != 1.0:
+        frame = cv2.resize(frame, None, fx=STREAM_SCALE, fy=STREAM_SCALE, interpolation=cv2.INTER_AREA)
+    ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, STREAM_JPEG_QUALITY])
+    return buffer.tobytes()
+
+# A single capture thread shared by every viewer: the camera is opened once and each frame is
+# encoded once; viewers always get the newest frame and simply skip frames they were too slow for.
+# The thread stops and releases the camera when the last viewer leaves.
+camera = None
+latest_frame = (0, None)  # (frame id, encoded JPEG)
+frame_ready = threading.Condition()
+
+def capture_frames():
+    global camera, capture_thread
     camera = cv2.VideoCapture(0)
-    
+    frame_id = 0
     while True:
+        with capture_lock:
+            if viewers == 0:
+                # Nobody watching: free the webcam; the next viewer starts a new capture thread
+                camera.release()
+                capture_thread = None
+                return
         success, frame = camera.read()
         if not success:
             break
         
         # Convert frame to bytes
-        ret, buffer = cv2.imencode('.jpg', frame)
-        frame = buffer.tobytes()
-        
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
+        frame_id += 1
+        set_latest_frame((frame_id, encode_frame(frame)))
+    with capture_lock:
+        camera.release()
+        capture_thread = None
+        set_latest_frame((-1, None))  # Tell viewers the camera stopped
+
+def set_latest_frame(value):
+    global latest_frame
+    with frame_ready:
+        latest_frame = value
+        frame_ready.notify_all()
+
+capture_lock = threading.Lock()
+capture_thread = None
+viewers = 0  # Clients currently streaming /video_feed
+
+# Register a viewer and start the capture thread if it isn't running
+def start_capture():
+    global capture_thread, viewers
+    with capture_lock:
+        viewers += 1
+        if capture_thread is None:
+            set_latest_frame((0, None))
+            capture_thread = threading.Thread(target=capture_frames, daemon=True)
+            capture_thread.start()
+
+def stop_capture():
+    global viewers
+    with capture_lock:
+        viewers -= 1
+
+def generate_frames():
+    start_capture()
+    last_id = 0
+    
+    try:
+        while True:
+            with frame_ready:
+                if not frame_ready.wait_for(lambda: latest_frame[0] != last_id, timeout=5):
+                    continue
+                last_id, frame = latest_frame
+            if last_id == -1:
+                break
+            if frame is None:
+                continue
+            
+            # Header, image and trailer as separate chunks so the image isn't copied again
+            yield (b'--frame\r\nContent-Type: image/jpeg\r\nContent-Length: ' +
+                   str(len(frame)).encode() + b'\r\n\r\n')
+            yield frame
+            yield b'\r\n'
+    finally:
+        stop_capture()  # Runs when the client disconnects, too
 
 @app.route('/video_feed')
 def video_feed():
@@ -0,0 +1,85 @@
+"""Finger-spelled words as a single image.
+
+The letter images are decoded once into arrays; a word is composited either into a sprite
+strip (one JPEG with the letters side by side) or an animated GIF showing one letter at a
+time. Composited words are kept in an LRU cache, so a repeated word costs a dict lookup.
+"""
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image
+
+FORMATS = {"sprite": "image/jpeg", "gif": "image/gif"}
+
+
+def load_letter_arrays(catalog, height=None):
+    """Decode every letter image in the catalog once; optionally scale to a common height"""
+    arrays = {}
+    for letter, entry in catalog.letters.items():
+        with Image.open(catalog.path(entry)) as im:
+            im = im.convert('RGB')
+            if height and im.height != height:
+                im = im.resize((round(im.width * height / im.height), height), Image.LANCZOS)
+            arrays[letter] = np.asarray(im)
+    return arrays
+
+
+class LetterSprites:
+    def __init__(self, catalog, height=128, max_words=256, frame_ms=800, max_letters=40):
+        self.letters = load_letter_arrays(catalog, height)
+        self.frame_ms = frame_ms  # How long each letter shows in the animation
+        self.max_letters = max_letters  # Longest word that will be composited; longer ones are spelled per letter
+        self.max_words = max_words
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()  # (word, format) -> (body, etag)
+        self._lock = threading.Lock()
+
+    def _sprite(self, word):
+        strip = np.hstack([self.letters[letter] for letter in word])
+        out = io.BytesIO()
+        Image.fromarray(strip).save(out, 'JPEG', quality=85)
+        return out.getvalue()
+
+    def _animation(self, word):
+        # Letters can differ in width; pad each frame onto a canvas as wide as the widest
+        width = max(self.letters[letter].shape[1] for letter in word)
+        frames = []
+        for letter in word:
+            array = self.letters[letter]
+            canvas = np.full((array.shape[0], width, 3), 255, dtype=np.uint8)
+            offset = (width - array.shape[1]) // 2
+            canvas[:, offset:offset + array.shape[1]] = array
+            frames.append(Image.fromarray(canvas))
+        out = io.BytesIO()
+        frames[0].save(out, 'GIF', save_all=True, append_images=frames[1:], duration=self.frame_ms, loop=0)
+        return out.getvalue()
+
+    def render(self, word, fmt="sprite"):
+        """Return (body, etag) for a word, or None if it has no letters we can show or is too long"""
+        word = "".join(letter for letter in word.lower() if letter in self.letters)
+        if not word or len(word) > self.max_letters or fmt not in FORMATS:
+            return None
+
+        key = (word, fmt)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+
+        body = self._sprite(word) if fmt == "sprite" else self._animation(word)
+        result = (body, hashlib.sha256(body).hexdigest())
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = result
+            while len(self._cache) > self.max_words:
+                self._cache.popitem(last=False)  # Evict the least recently used word
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {"cached_words": len(self._cache), "hits": self.hits, "misses": self.misses}
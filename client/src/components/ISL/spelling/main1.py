@@ -1,5 +1,4 @@
 import speech_recognition as sr
-import numpy as np
 import matplotlib.pyplot as plt
 import cv2
 from easygui import *
@@ -8,29 +7,14 @@ from PIL import Image, ImageTk
 from itertools import count
 import tkinter as tk
 import string
+from sign_catalog import SignCatalog
+from letter_sprites import load_letter_arrays
 
 def func():
         r = sr.Recognizer()
-        isl_gif=['any questions', 'are you angry', 'are you busy', 'are you hungry', 'are you sick', 'be careful',
-                'can we meet tomorrow', 'did you book tickets', 'did you finish homework', 'do you go to office', 'do you have money',
-                'do you want something to drink', 'do you want tea or coffee', 'do you watch TV', 'dont worry', 'flower is beautiful',
-                'good afternoon', 'good evening', 'good morning', 'good night', 'good question', 'had your lunch', 'happy journey',
-                'hello what is your name', 'how many people are there in your family', 'i am a clerk', 'i am bore doing nothing', 
-                 'i am fine', 'i am sorry', 'i am thinking', 'i am tired', 'i dont understand anything', 'i go to a theatre', 'i love to shop',
-                'i had to say something but i forgot', 'i have headache', 'i like pink colour', 'i live in nagpur', 'lets go for lunch', 'my mother is a homemaker',
-                'my name is john', 'nice to meet you', 'no smoking please', 'open the door', 'please call me later',
-                'please clean the room', 'please give me your pen', 'please use dustbin dont throw garbage', 'please wait for sometime', 'shall I help you',
-                'shall we go together tommorow', 'sign language interpreter', 'sit down', 'stand up', 'take care', 'there was traffic jam', 'wait I am thinking',
-                'what are you doing', 'what is the problem', 'what is todays date', 'what is your father do', 'what is your job',
-                'what is your mobile number', 'what is your name', 'whats up', 'when is your interview', 'when we will go', 'where do you stay',
-                'where is the bathroom', 'where is the police station', 'you are wrong','address','agra','ahemdabad', 'all', 'april', 'assam', 'august', 'australia', 'badoda', 'banana', 'banaras', 'banglore',
-'bihar','bihar','bridge','cat', 'chandigarh', 'chennai', 'christmas', 'church', 'clinic', 'coconut', 'crocodile','dasara',
-'deaf', 'december', 'deer', 'delhi', 'dollar', 'duck', 'febuary', 'friday', 'fruits', 'glass', 'grapes', 'gujrat', 'hello',
-'hindu', 'hyderabad', 'india', 'january', 'jesus', 'job', 'july', 'july', 'karnataka', 'kerala', 'krishna', 'litre', 'mango',
-'may', 'mile', 'monday', 'mumbai', 'museum', 'muslim', 'nagpur', 'october', 'orange', 'pakistan', 'pass', 'police station',
-'post office', 'pune', 'punjab', 'rajasthan', 'ram', 'restaurant', 'saturday', 'september', 'shop', 'sleep', 'southafrica',
-'story', 'sunday', 'tamil nadu', 'temperature', 'temple', 'thursday', 'toilet', 'tomato', 'town', 'tuesday', 'usa', 'village',
-'voice', 'wednesday', 'weight','please wait for sometime','what is your mobile number','what are you doing','are you busy']
+        # Signs available on disk, from the shared catalog (see sign_catalog.py)
+        catalog = SignCatalog.load()
+        letter_images = load_letter_arrays(catalog)  # Letter images decoded once, not per letter
         
         
         arr=['a','b','c','d','e','f','g','h','i','j','k','l','m','n','o','p','q','r',
@@ -52,7 +36,7 @@ def func():
                                         print("oops!Time To say good bye")
                                         break
                                 
-                                elif(a.lower() in isl_gif):
+                                elif(catalog.phrase(a) is not None):
                                     
                                     class ImageLabel(tk.Label):
                                             def load(self, im):
@@ -92,17 +76,14 @@ def func():
                                     root = tk.Tk()
                                     lbl = ImageLabel(root)
                                     lbl.pack()
-                                    lbl.load(r'ISL_Gifs/{0}.gif'.format(a.lower()))
+                                    lbl.load(catalog.path(catalog.phrase(a)))
                                     root.mainloop()
                                 else:
 
                                     for i in range(len(a)):
-                                                    if(a[i] in arr):
+                                                    if(a[i] in letter_images):
                                             
-                                                            ImageAddress = 'letters/'+a[i]+'.jpg'
-                                                            ImageItself = Image.open(ImageAddress)
-                                                            ImageNumpyFormat = np.asarray(ImageItself)
-                                                            plt.imshow(ImageNumpyFormat)
+                                                            plt.imshow(letter_images[a[i]])
                                                             plt.draw()
                                                             plt.pause(0.8)
                                                     else:
@@ -0,0 +1,73 @@
+"""Phrase index for the ISL spelling service.
+
+Phrases with a sign GIF are stored in a hash map keyed by their normalized form and in a
+token trie, so an utterance can be split into the longest known phrases with single
+words left over for finger-spelling.
+"""
+import string
+
+_END = None  # Trie key marking the end of a phrase (tokens are never None)
+_PUNCTUATION = str.maketrans("", "", string.punctuation)
+
+
+def normalize_phrase(text):
+    """Lowercase, drop punctuation and collapse whitespace"""
+    return " ".join(text.translate(_PUNCTUATION).lower().split())
+
+
+class PhraseIndex:
+    """Hash + token-trie index over sign phrases"""
+
+    def __init__(self, phrases=()):
+        self.phrases = {}  # normalized phrase -> phrase as listed (the GIF name)
+        self._trie = {}
+        for phrase in phrases:
+            self.add(phrase)
+
+    def add(self, phrase):
+        key = normalize_phrase(phrase)
+        if not key or key in self.phrases:
+            return  # Empty or duplicate
+        self.phrases[key] = phrase
+        node = self._trie
+        for token in key.split():
+            node = node.setdefault(token, {})
+        node[_END] = phrase
+
+    def get(self, text):
+        """Return the phrase matching text exactly (after normalization), or None"""
+        return self.phrases.get(normalize_phrase(text))
+
+    def __contains__(self, text):
+        return normalize_phrase(text) in self.phrases
+
+    def __iter__(self):
+        return iter(self.phrases.values())
+
+    def __len__(self):
+        return len(self.phrases)
+
+    def segment(self, text):
+        """Split text greedily into the longest known phrases.
+
+        Returns a list of ("gif", phrase) and ("word", word) tuples in order.
+        """
+        tokens = normalize_phrase(text).split()
+        segments = []
+        i = 0
+        while i < len(tokens):
+            node = self._trie
+            match = None
+            j = i
+            while j < len(tokens) and tokens[j] in node:
+                node = node[tokens[j]]
+                j += 1
+                if _END in node:
+                    match = (j, node[_END])
+            if match is not None:
+                i, phrase = match
+                segments.append(("gif", phrase))
+            else:
+                segments.append(("word", tokens[i]))
+                i += 1
+        return segments
@@ -0,0 +1,50 @@
+"""HTTP serving of sign assets (GIFs and letter images).
+
+Every asset is identified by the SHA-256 from the sign catalog:
+- the strong ETag is the content hash, so If-None-Match requests are answered with 304
+- URLs handed to clients carry ?v=<hash prefix>; a request whose version matches the current
+  content is cached for a year as immutable, any other request must revalidate
+- byte ranges (206) are served by Flask's conditional send_file
+"""
+from flask import Response, request, send_file
+
+VERSION_LENGTH = 12
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+def asset_version(entry):
+    """Short content version of a catalog entry"""
+    return entry["sha256"][:VERSION_LENGTH]
+
+
+def versioned_url(url, entry):
+    """Append the content version to an asset URL"""
+    return f"{url}?v={asset_version(entry)}"
+
+
+def send_asset(path, entry, mimetype=None, etag=None):
+    """Send an asset file with ETag, Cache-Control, 304 and Range handling
+
+    etag overrides the entry's hash when a variant of the asset is sent instead of the original.
+    """
+    response = send_file(path, mimetype=mimetype, conditional=True, etag=etag or entry["sha256"])
+    return _cache_headers(response, asset_version(entry))
+
+
+def send_generated(body, mimetype, etag, version):
+    """Send an in-memory asset (e.g. a composited word) with the same caching rules"""
+    response = Response(body, mimetype=mimetype)
+    response.set_etag(etag)
+    return _cache_headers(response.make_conditional(request, accept_ranges=True, complete_length=len(body)), version)
+
+
+def _cache_headers(response, version):
+    if request.args.get('v') == version:
+        # The URL changes whenever the content does, so this response never goes stale
+        response.cache_control.no_cache = None  # send_file sets no-cache; it would force revalidation
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True  # Unversioned or outdated URL: revalidate with the ETag
+    return response
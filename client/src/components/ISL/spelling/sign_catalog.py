@@ -0,0 +1,171 @@
+"""Sign catalog for the ISL spelling service.
+
+Scans ISL_Gifs/ (phrase GIFs) and letters/ (finger-spelling images) into a manifest that
+records, for every sign, its file, size, frame count, duration and SHA-256. The manifest is
+written next to this file and reused on later starts as long as the folders are unchanged,
+so lookups never touch the disk.
+
+Build it offline with:  python sign_catalog.py
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+from phrase_index import normalize_phrase
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ISL_GIF_FOLDER = os.path.join(BASE_DIR, 'ISL_Gifs')
+LETTERS_FOLDER = os.path.join(BASE_DIR, 'letters')
+MANIFEST_PATH = os.path.join(BASE_DIR, 'sign_manifest.json')
+MANIFEST_VERSION = 1
+
+
+def file_sha256(path):
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def image_info(path):
+    """Return (frame count, total duration in ms) of an image; (None, None) without Pillow"""
+    try:
+        from PIL import Image
+    except ImportError:
+        return None, None
+    try:
+        with Image.open(path) as im:
+            frames = getattr(im, 'n_frames', 1)
+            duration = 0
+            for index in range(frames):
+                im.seek(index)
+                duration += im.info.get('duration', 0)
+            return frames, duration
+    except Exception as e:
+        print(f"Could not read {path}: {e}")
+        return None, None
+
+
+def _scan(folder, extension):
+    """Files in folder with the given extension, sorted by name"""
+    if not os.path.isdir(folder):
+        return []
+    return sorted((entry for entry in os.scandir(folder)
+                   if entry.is_file() and entry.name.lower().endswith(extension)), key=lambda entry: entry.name)
+
+
+def folder_signature(gif_folder, letters_folder):
+    """Cheap fingerprint (names, sizes, mtimes) used to tell whether a manifest is stale"""
+    digest = hashlib.sha256()
+    for entry in _scan(gif_folder, '.gif') + _scan(letters_folder, '.jpg'):
+        stat = entry.stat()
+        digest.update(f"{entry.path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _describe(path, name):
+    frames, duration = image_info(path)
+    return {
+        "name": name,
+        "file": os.path.relpath(path, BASE_DIR),
+        "size": os.path.getsize(path),
+        "frames": frames,
+        "duration_ms": duration,
+        "sha256": file_sha256(path),
+    }
+
+
+def build_manifest(gif_folder=ISL_GIF_FOLDER, letters_folder=LETTERS_FOLDER):
+    """Scan the sign folders into a manifest dict"""
+    phrases = {}
+    for entry in _scan(gif_folder, '.gif'):
+        name = entry.name[:-len('.gif')]
+        key = normalize_phrase(name)
+        if key and key not in phrases:
+            phrases[key] = _describe(entry.path, name)
+
+    letters = {}
+    for entry in _scan(letters_folder, '.jpg'):
+        letter = entry.name[:-len('.jpg')].lower()
+        if len(letter) == 1 and letter.isalpha():
+            letters[letter] = _describe(entry.path, letter)
+
+    return {
+        "version": MANIFEST_VERSION,
+        "signature": folder_signature(gif_folder, letters_folder),
+        "phrases": phrases,
+        "letters": letters,
+    }
+
+
+def write_manifest(manifest, path=MANIFEST_PATH):
+    """Write the manifest atomically"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class SignCatalog:
+    """In-memory view of the manifest"""
+
+    def __init__(self, manifest):
+        self.manifest = manifest
+        self.phrases = manifest["phrases"]  # normalized phrase -> entry
+        self.letters = manifest["letters"]  # letter -> entry
+        # Changes whenever any sign is added, removed or edited
+        digest = hashlib.sha256()
+        for key in sorted(self.phrases):
+            digest.update(f"{key}\0{self.phrases[key]['sha256']}\n".encode('utf-8'))
+        for key in sorted(self.letters):
+            digest.update(f"{key}\0{self.letters[key]['sha256']}\n".encode('utf-8'))
+        self.etag = digest.hexdigest()
+
+    @classmethod
+    def load(cls, gif_folder=ISL_GIF_FOLDER, letters_folder=LETTERS_FOLDER, manifest_path=MANIFEST_PATH):
+        """Load the manifest if it matches the folders, otherwise rebuild and save it"""
+        try:
+            with open(manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION and \
+                    manifest.get("signature") == folder_signature(gif_folder, letters_folder):
+                return cls(manifest)
+        except (OSError, ValueError):
+            pass
+
+        manifest = build_manifest(gif_folder, letters_folder)
+        try:
+            write_manifest(manifest, manifest_path)
+        except OSError as e:
+            print(f"Could not write {manifest_path}: {e}")
+        return cls(manifest)
+
+    def phrase(self, text):
+        """Manifest entry for a phrase (any case or punctuation), or None"""
+        return self.phrases.get(normalize_phrase(text))
+
+    def letter(self, letter):
+        """Manifest entry for a letter, or None"""
+        return self.letters.get(letter.lower())
+
+    def phrase_names(self):
+        """Phrase names as they appear in the GIF file names"""
+        return [entry["name"] for entry in self.phrases.values()]
+
+    @staticmethod
+    def path(entry):
+        """Absolute path of a manifest entry's file"""
+        return os.path.join(BASE_DIR, entry["file"])
+
+
+if __name__ == '__main__':
+    manifest = build_manifest()
+    write_manifest(manifest)
+    print(f"Wrote {MANIFEST_PATH}: {len(manifest['phrases'])} phrases, {len(manifest['letters'])} letters")
@@ -0,0 +1,162 @@
+"""Compact variants of the ISL sign GIFs.
+
+An offline job transcodes every GIF in the sign catalog, in parallel across CPU cores, into
+animated WebP (Pillow) and H.264 MP4 (ffmpeg, if installed), optionally scaled down to a
+maximum width. Variants are named after the source GIF's SHA-256, so a changed GIF simply
+has no variants until the job runs again; only variants smaller than the GIF are kept.
+The asset endpoint picks the smallest variant the client's Accept header names explicitly
+and falls back to the original GIF.
+
+Run with:  python sign_variants.py [--workers N] [--max-width 480] [--formats webp mp4]
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from sign_catalog import BASE_DIR, SignCatalog, file_sha256, write_manifest
+
+VARIANTS_FOLDER = os.path.join(BASE_DIR, 'ISL_Variants')
+VARIANTS_MANIFEST = os.path.join(VARIANTS_FOLDER, 'variants.json')
+MIMETYPES = {"webp": "image/webp", "mp4": "video/mp4"}
+
+
+def to_webp(src, dst, max_width=None, quality=70):
+    """Animated WebP with the GIF's frame timings"""
+    from PIL import Image, ImageSequence
+
+    with Image.open(src) as im:
+        frames, durations = [], []
+        for frame in ImageSequence.Iterator(im):
+            durations.append(frame.info.get('duration', 100))
+            frame = frame.convert('RGBA')
+            if max_width and frame.width > max_width:
+                frame = frame.resize((max_width, round(frame.height * max_width / frame.width)), Image.LANCZOS)
+            frames.append(frame)
+    frames[0].save(dst, 'WEBP', save_all=True, append_images=frames[1:], duration=durations,
+                   loop=0, quality=quality, method=4)
+
+
+def to_mp4(src, dst, max_width=None, crf=28):
+    """H.264 MP4 with ffmpeg; dimensions rounded down to even numbers as yuv420p requires"""
+    width = f"min(iw\\,{max_width})" if max_width else "iw"
+    subprocess.run(
+        ["ffmpeg", "-y", "-loglevel", "error", "-i", src,
+         "-vf", f"scale=trunc({width}/2)*2:-2", "-c:v", "libx264", "-crf", str(crf),
+         "-pix_fmt", "yuv420p", "-movflags", "+faststart", "-an", "-f", "mp4", dst],
+        check=True
+    )
+
+
+CONVERTERS = {"webp": to_webp, "mp4": to_mp4}
+
+
+def transcode_one(src, sha256, formats, max_width, output_folder):
+    """Produce the variants of one GIF; returns (sha256, list of variant entries)"""
+    variants = []
+    original_size = os.path.getsize(src)
+    for fmt in formats:
+        dst = os.path.join(output_folder, f"{sha256[:16]}-{max_width or 'full'}.{fmt}")
+        if not os.path.exists(dst):
+            fd, tmp_path = tempfile.mkstemp(dir=output_folder, suffix=f".{fmt}")
+            os.close(fd)
+            try:
+                CONVERTERS[fmt](src, tmp_path, max_width)
+                os.replace(tmp_path, dst)
+            except Exception as e:
+                print(f"Could not convert {src} to {fmt}: {e}")
+                continue
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        size = os.path.getsize(dst)
+        if size >= original_size:
+            continue  # No smaller than the GIF, not worth serving
+        variants.append({
+            "format": fmt,
+            "mimetype": MIMETYPES[fmt],
+            "file": os.path.relpath(dst, BASE_DIR),
+            "size": size,
+            "sha256": file_sha256(dst),
+        })
+    return sha256, variants
+
+
+def build_variants(catalog, formats=("webp", "mp4"), max_width=None, workers=None, output_folder=VARIANTS_FOLDER):
+    """Transcode every phrase GIF in the catalog in parallel and write the variants manifest"""
+    os.makedirs(output_folder, exist_ok=True)
+    if "mp4" in formats and shutil.which("ffmpeg") is None:
+        print("ffmpeg not found, skipping mp4")
+        formats = [fmt for fmt in formats if fmt != "mp4"]
+
+    variants = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(transcode_one, catalog.path(entry), entry["sha256"], formats, max_width,
+                                   output_folder)
+                   for entry in catalog.phrases.values()]
+        for future in as_completed(futures):
+            sha256, entries = future.result()
+            if entries:
+                variants[sha256] = entries
+
+    manifest = {"options": {"formats": list(formats), "max_width": max_width}, "variants": variants}
+    write_manifest(manifest, os.path.join(output_folder, 'variants.json'))
+    return manifest
+
+
+class SignVariants:
+    """Variants manifest loaded at startup; files are checked once, never per request"""
+
+    def __init__(self, manifest_path=VARIANTS_MANIFEST):
+        self.variants = {}  # source sha256 -> variant entries, smallest first
+        try:
+            with open(manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Could not read {manifest_path}: {e}")
+            return
+        for sha256, entries in manifest.get("variants", {}).items():
+            entries = [entry for entry in entries if os.path.exists(os.path.join(BASE_DIR, entry["file"]))]
+            if entries:
+                self.variants[sha256] = sorted(entries, key=lambda entry: entry["size"])
+
+    def choose(self, entry, accept_mimetypes):
+        """Smallest variant whose type the client lists explicitly (not via */*), or None"""
+        accepted = {mimetype for mimetype, quality in accept_mimetypes if quality > 0}
+        for variant in self.variants.get(entry["sha256"], ()):
+            if variant["mimetype"] in accepted:
+                return variant
+        return None
+
+    def __len__(self):
+        return len(self.variants)
+
+    @staticmethod
+    def path(variant):
+        """Absolute path of a variant file"""
+        return os.path.join(BASE_DIR, variant["file"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcode ISL sign GIFs to smaller formats.")
+    parser.add_argument("--formats", nargs="+", default=["webp", "mp4"], choices=sorted(CONVERTERS))
+    parser.add_argument("--max-width", type=int, default=None, help="Scale variants down to this width")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: CPU count)")
+    args = parser.parse_args()
+
+    catalog = SignCatalog.load()
+    manifest = build_variants(catalog, args.formats, args.max_width, args.workers)
+    original = sum(entry["size"] for entry in catalog.phrases.values())
+    smallest = sum(min((v["size"] for v in manifest["variants"].get(entry["sha256"], ())), default=entry["size"])
+                   for entry in catalog.phrases.values())
+    print(f"{len(manifest['variants'])}/{len(catalog.phrases)} GIFs have variants; "
+          f"{original / 1e6:.1f} MB -> {smallest / 1e6:.1f} MB smallest")
+
+
+if __name__ == '__main__':
+    main()
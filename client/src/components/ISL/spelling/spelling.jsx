@@ -9,6 +9,8 @@ const HearingImpairmentAssistant = () => {
   const [transcript, setTranscript] = useState('');
   const [signGif, setSignGif] = useState(null);
   const [letterSigns, setLetterSigns] = useState([]);
+  const [signSegments, setSignSegments] = useState([]);
+  const [letterSprite, setLetterSprite] = useState(null);
   const [availableSigns, setAvailableSigns] = useState([]);
   const [recognitionSupported, setRecognitionSupported] = useState(true);
   const [error, setError] = useState(null);
@@ -105,9 +107,19 @@ const HearingImpairmentAssistant = () => {
     if (data.type === 'gif') {
       setSignGif(data.gifUrl);
       setLetterSigns([]);
+      setLetterSprite(null);
+      setSignSegments([]);
     } else if (data.type === 'letters') {
       setSignGif(null);
       setLetterSigns(data.letterUrls);
+      setLetterSprite(data.spriteUrl || null);  // Whole word in one image
+      setSignSegments([]);
+    } else if (data.type === 'mixed') {
+      // Phrase GIFs and finger-spelled words, in spoken order
+      setSignGif(null);
+      setLetterSigns([]);
+      setLetterSprite(null);
+      setSignSegments(data.segments);
     }
   };
   
@@ -241,15 +253,23 @@ const HearingImpairmentAssistant = () => {
           <div className="mb-6">
             <div className="mb-2 font-medium">Letter Signs:</div>
             <div className="flex flex-wrap gap-2 justify-center">
-              {letterSigns.map((letterUrl, index) => (
+              {letterSprite ? (
+                <div className="border rounded p-2 bg-gray-50">
+                  <img 
+                    src={`${API_BASE_URL}${letterSprite}`} 
+                    alt={`Letter signs for ${transcript}`}
+                    className="h-16 w-auto max-w-full"
+                  />
+                </div>
+              ) : letterSigns.map((letterUrl, index) => (
                 <div key={index} className="border rounded p-2 bg-gray-50">
                   <img 
                     src={`${API_BASE_URL}${letterUrl}`} 
-                    alt={`Sign for letter ${letterUrl.split('/').pop()}`}
+                    alt={`Sign for letter ${letterUrl.split('/').pop().split('?')[0]}`}
                     className="w-16 h-16 object-contain"
                     onError={(e) => {
                       e.target.onerror = null; 
-                      e.target.src = 'https://via.placeholder.com/80?text=' + letterUrl.split('/').pop();
+                      e.target.src = 'https://via.placeholder.com/80?text=' + letterUrl.split('/').pop().split('?')[0];
                     }}
                   />
                 </div>
@@ -258,6 +278,43 @@ const HearingImpairmentAssistant = () => {
           </div>
         )}
         
+        {signSegments.length > 0 && (
+          <div className="mb-6">
+            <div className="mb-2 font-medium">Sign Language:</div>
+            <div className="flex flex-wrap gap-4 justify-center items-center">
+              {signSegments.map((segment, index) => (
+                <div key={index} className="border rounded p-2 bg-gray-50">
+                  {segment.type === 'gif' ? (
+                    <img 
+                      src={`${API_BASE_URL}${segment.gifUrl}`} 
+                      alt={`Sign for ${segment.text}`}
+                      className="max-w-xs h-auto"
+                    />
+                  ) : segment.spriteUrl ? (
+                    <img 
+                      src={`${API_BASE_URL}${segment.spriteUrl}`} 
+                      alt={`Letter signs for ${segment.text}`}
+                      className="h-12 w-auto"
+                    />
+                  ) : (
+                    <div className="flex gap-1">
+                      {segment.letterUrls.map((letterUrl, letterIndex) => (
+                        <img 
+                          key={letterIndex}
+                          src={`${API_BASE_URL}${letterUrl}`} 
+                          alt={`Sign for letter ${letterUrl.split('/').pop().split('?')[0]}`}
+                          className="w-12 h-12 object-contain"
+                        />
+                      ))}
+                    </div>
+                  )}
+                  <div className="text-center text-sm text-gray-600 mt-1">{segment.text}</div>
+                </div>
+              ))}
+            </div>
+          </div>
+        )}
+        
         <div className="mt-8 bg-blue-50 p-4 rounded">
           <h3 className="font-medium mb-2">Instructions:</h3>
           <ul className="list-disc pl-5 space-y-1">
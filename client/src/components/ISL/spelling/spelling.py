@@ -6,32 +6,15 @@ import string
 import tempfile
 import base64
 import json
+from phrase_index import PhraseIndex
+from sign_catalog import SignCatalog
+from sign_assets import asset_version, send_asset, send_generated, versioned_url
+from letter_sprites import FORMATS as SPELL_FORMATS, LetterSprites
+from sign_variants import SignVariants
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
-# Store the ISL GIF phrases list
-isl_gif = ['any questions', 'are you angry', 'are you busy', 'are you hungry', 'are you sick', 'be careful',
-    'can we meet tomorrow', 'did you book tickets', 'did you finish homework', 'do you go to office', 'do you have money',
-    'do you want something to drink', 'do you want tea or coffee', 'do you watch TV', 'dont worry', 'flower is beautiful',
-    'good afternoon', 'good evening', 'good morning', 'good night', 'good question', 'had your lunch', 'happy journey',
-    'hello what is your name', 'how many people are there in your family', 'i am a clerk', 'i am bore doing nothing',
-    'i am fine', 'i am sorry', 'i am thinking', 'i am tired', 'i dont understand anything', 'i go to a theatre', 'i love to shop',
-    'i had to say something but i forgot', 'i have headache', 'i like pink colour', 'i live in nagpur', 'lets go for lunch', 'my mother is a homemaker',
-    'my name is john', 'nice to meet you', 'no smoking please', 'open the door', 'please call me later',
-    'please clean the room', 'please give me your pen', 'please use dustbin dont throw garbage', 'please wait for sometime', 'shall I help you',
-    'shall we go together tommorow', 'sign language interpreter', 'sit down', 'stand up', 'take care', 'there was traffic jam', 'wait I am thinking',
-    'what are you doing', 'what is the problem', 'what is todays date', 'what is your father do', 'what is your job',
-    'what is your mobile number', 'what is your name', 'whats up', 'when is your interview', 'when we will go', 'where do you stay',
-    'where is the bathroom', 'where is the police station', 'you are wrong', 'address', 'agra', 'ahemdabad', 'all', 'april', 'assam', 'august', 'australia', 'badoda', 'banana', 'banaras', 'banglore',
-    'bihar', 'bridge', 'cat', 'chandigarh', 'chennai', 'christmas', 'church', 'clinic', 'coconut', 'crocodile', 'dasara',
-    'deaf', 'december', 'deer', 'delhi', 'dollar', 'duck', 'febuary', 'friday', 'fruits', 'glass', 'grapes', 'gujrat', 'hello',
-    'hindu', 'hyderabad', 'india', 'january', 'jesus', 'job', 'july', 'karnataka', 'kerala', 'krishna', 'litre', 'mango',
-    'may', 'mile', 'monday', 'mumbai', 'museum', 'muslim', 'nagpur', 'october', 'orange', 'pakistan', 'pass', 'police station',
-    'post office', 'pune', 'punjab', 'rajasthan', 'ram', 'restaurant', 'saturday', 'september', 'shop', 'sleep', 'southafrica',
-    'story', 'sunday', 'tamil nadu', 'temperature', 'temple', 'thursday', 'toilet', 'tomato', 'town', 'tuesday', 'usa', 'village',
-    'voice', 'wednesday', 'weight', 'please wait for sometime', 'what is your mobile number', 'what are you doing', 'are you busy']
-
 # Configure paths for the static files
 ISL_GIF_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ISL_Gifs')
 LETTERS_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'letters')
@@ -40,16 +23,35 @@ LETTERS_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lette
 os.makedirs(ISL_GIF_FOLDER, exist_ok=True)
 os.makedirs(LETTERS_FOLDER, exist_ok=True)
 
+# Catalog of the available signs, built from the folders above (see sign_catalog.py)
+sign_catalog = SignCatalog.load(ISL_GIF_FOLDER, LETTERS_FOLDER)
+
+# Smaller WebP/MP4 versions of the GIFs, if sign_variants.py has been run
+sign_variants = SignVariants()
+
+# Letter images decoded once, with an LRU of finger-spelled words composited from them
+letter_sprites = LetterSprites(sign_catalog)
+spell_version = asset_version({"sha256": sign_catalog.etag})  # Composited words depend on every letter image
+
+# Index of the catalog's phrases for exact lookups and longest-match segmentation
+phrase_index = PhraseIndex(sign_catalog.phrase_names())
+
 # Alphabet array
 alphabet = list(string.ascii_lowercase)
 
+# The list of signs only changes with the catalog, so it is built once and served with an ETag
+signs_payload = {
+    "signs": list(phrase_index),
+    "alphabet": alphabet
+}
+
 @app.route('/api/signs', methods=['GET'])
 def get_available_signs():
     """Return the list of available sign phrases"""
-    return jsonify({
-        "signs": isl_gif,
-        "alphabet": alphabet
-    })
+    response = jsonify(signs_payload)
+    response.set_etag(sign_catalog.etag)
+    response.cache_control.no_cache = True  # Revalidate, usually answered with 304
+    return response.make_conditional(request)
 
 @app.route('/api/recognize', methods=['POST'])
 def recognize_speech():
@@ -102,38 +104,96 @@ def process_recognized_text(text):
             "action": "exit"
         })
     
-    # Check if text is in the isl_gif list
-    if text in isl_gif:
-        return jsonify({
-            "text": text,
-            "type": "gif",
-            "gifUrl": f"/api/gif/{text}"
-        })
+    # Split the text into the longest phrases that have a GIF; other words are finger-spelled
+    segments = phrase_index.segment(text)
+    if len(segments) == 1 and segments[0][0] == "gif":
+        return jsonify(dict(gif_segment(segments[0][1]), text=text))
+    elif len(segments) <= 1:
+        # A single word (or nothing): return its individual letters
+        return jsonify(dict(letters_segment(text), text=text))
     else:
-        # Return individual letters
-        letters = [char for char in text if char in alphabet]
+        # Mixed sequence of GIF and letter segments, one per phrase or word, in spoken order
         return jsonify({
             "text": text,
-            "type": "letters",
-            "letters": letters,
-            "letterUrls": [f"/api/letter/{letter}" for letter in letters]
+            "type": "mixed",
+            "segments": [gif_segment(value) if kind == "gif" else letters_segment(value)
+                         for kind, value in segments]
         })
 
+def gif_segment(phrase):
+    """Sign data for a phrase that has a GIF"""
+    return {
+        "text": phrase,
+        "type": "gif",
+        "gifUrl": versioned_url(f"/api/gif/{phrase}", sign_catalog.phrase(phrase))
+    }
+
+def letters_segment(text):
+    """Sign data for finger-spelling text letter by letter"""
+    letters = [char for char in text if char in alphabet]
+    return {
+        "text": text,
+        "type": "letters",
+        "letters": letters,
+        "letterUrls": [letter_url(letter) for letter in letters],
+        "spriteUrl": spell_url(letters)
+    }
+
+def spell_url(letters):
+    """Versioned URL of the whole word as one sprite image
+
+    None if there are no letters or the word is too long for a sprite; the client then shows
+    the letter images one by one.
+    """
+    if not letters or len(letters) > letter_sprites.max_letters:
+        return None
+    return f"/api/spell/{''.join(letters)}?v={spell_version}"
+
+def letter_url(letter):
+    """Versioned URL of a letter image (unversioned if the letter has no image)"""
+    entry = sign_catalog.letter(letter)
+    return versioned_url(f"/api/letter/{letter}", entry) if entry else f"/api/letter/{letter}"
+
 @app.route('/api/gif/<filename>', methods=['GET'])
 def get_gif(filename):
     """Serve the sign language GIF for a specific phrase"""
-    # In a real app, you would check if the file exists and return accordingly
-    # For this example, we'll just try to serve from the GIF folder
-    return send_from_directory(ISL_GIF_FOLDER, f"{filename}.gif")
+    # Unknown phrases are rejected from the catalog without touching the disk
+    entry = sign_catalog.phrase(filename)
+    if entry is None:
+        return jsonify({"error": "Sign not found"}), 404
+
+    # Serve the smallest variant the client accepts, falling back to the original GIF
+    variant = sign_variants.choose(entry, request.accept_mimetypes)
+    if variant is not None:
+        response = send_asset(sign_variants.path(variant), entry, mimetype=variant["mimetype"],
+                              etag=variant["sha256"])
+    else:
+        response = send_asset(sign_catalog.path(entry), entry, mimetype='image/gif')
+    response.vary.add('Accept')  # The body depends on the Accept header
+    return response
 
 @app.route('/api/letter/<letter>', methods=['GET'])
 def get_letter(letter):
     """Serve the sign language image for a specific letter"""
     # Check if the letter is valid
-    if letter.lower() in alphabet:
-        return send_from_directory(LETTERS_FOLDER, f"{letter.lower()}.jpg")
-    else:
+    if letter.lower() not in alphabet:
         return jsonify({"error": "Invalid letter requested"}), 400
+    entry = sign_catalog.letter(letter)
+    if entry is None:
+        return jsonify({"error": "Sign not found"}), 404
+    return send_asset(sign_catalog.path(entry), entry, mimetype='image/jpeg')
+
+@app.route('/api/spell/<word>', methods=['GET'])
+def get_spelling(word):
+    """Serve a finger-spelled word as one image: ?format=sprite (letters side by side) or gif (animated)"""
+    fmt = request.args.get('format', 'sprite')
+    if fmt not in SPELL_FORMATS:
+        return jsonify({"error": f"Invalid format; expected one of {', '.join(SPELL_FORMATS)}"}), 400
+    rendered = letter_sprites.render(word, fmt)
+    if rendered is None:
+        return jsonify({"error": f"Expected 1 to {letter_sprites.max_letters} letters to spell"}), 400
+    body, etag = rendered
+    return send_generated(body, SPELL_FORMATS[fmt], etag, spell_version)
 
 @app.route('/api/test-speech', methods=['POST'])
 def test_speech():
@@ -0,0 +1,56 @@
+"""Cache headers of the sign asset responses.
+
+Run with:  python -m pytest client/src/components/ISL/spelling/tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+from sign_assets import asset_version, send_asset, send_generated
+
+ENTRY = {"sha256": "0123456789abcdef" * 4}
+ETAG = f'"{ENTRY["sha256"]}"'
+
+
+class SignAssetsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        fd, cls.path = tempfile.mkstemp(suffix='.gif')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(b'GIF89a' + bytes(100))
+
+        app = Flask(__name__)
+        app.add_url_rule('/asset', 'asset', lambda: send_asset(cls.path, ENTRY, mimetype='image/gif'))
+        app.add_url_rule('/generated', 'generated',
+                         lambda: send_generated(b'word', 'image/jpeg', ENTRY["sha256"], asset_version(ENTRY)))
+        cls.client = app.test_client()
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.path)
+
+    def test_versioned_url_is_immutable(self):
+        for url in ('/asset', '/generated'):
+            response = self.client.get(f'{url}?v={asset_version(ENTRY)}')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.headers['Cache-Control'], 'public, max-age=31536000, immutable')
+            self.assertEqual(response.headers['ETag'], ETAG)
+
+    def test_unversioned_or_outdated_url_revalidates(self):
+        for query in ('', '?v=outdated'):
+            response = self.client.get(f'/asset{query}')
+            self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+            self.assertEqual(response.headers['ETag'], ETAG)
+
+    def test_matching_etag_is_not_modified(self):
+        response = self.client.get('/asset', headers={'If-None-Match': ETAG})
+        self.assertEqual(response.status_code, 304)
+
+
+if __name__ == '__main__':
+    unittest.main()